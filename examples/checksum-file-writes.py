@@ -29,17 +29,164 @@ The method works correctly on any file-like object that has a write method, it
 also doens't require multiple definitions, the one ``written_hash_proxy`` does
 everything needed for all file-like classes.
 """
-from __future__ import print_function
-
-import hashlib
 import argparse
-try:
-    import urllib2 as requestlib
-except:
-    from urllib import request as requestlib
+import functools
+import hashlib
+import os
+import posixpath
+import queue
+import stat
+import sys
+import threading
+import timeit
+from concurrent import futures
+from urllib import parse as parselib
+from urllib import request as requestlib
 
 from padme import proxy
 
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+# Size of the single buffer that is used to move data from the reader to the
+# written_hash_proxy. The same buffer is reused for the whole download.
+#
+# Each chunk costs one intercepted write(), one digest update and one system
+# call so small chunks are dominated by fixed, per-call overhead. The cost per
+# byte levels off somewhere around 64 KiB; 1 MiB keeps the number of Python
+# level calls negligible while still fitting comfortably in memory.
+BUFSIZE = 1 << 20
+
+
+def _has_sha_extensions():
+    """
+    Check if the CPU advertises hardware SHA-256 instructions.
+
+    :returns:
+        True if ``/proc/cpuinfo`` lists the ``sha_ni`` (x86) or ``sha2`` (ARM)
+        feature flag, False otherwise (including when the file is missing).
+    """
+    try:
+        with open('/proc/cpuinfo') as stream:
+            for line in stream:
+                key, _, value = line.partition(':')
+                if key.strip() in ('flags', 'Features'):
+                    flags = value.split()
+                    return 'sha_ni' in flags or 'sha2' in flags
+    except OSError:
+        pass
+    return False
+
+
+# With SHA extensions OpenSSL computes SHA-256 much faster than MD5, which has
+# no hardware support at all. Otherwise stick to the traditional default.
+DEFAULT_DIGEST = 'sha256' if _has_sha_extensions() else 'md5'
+
+# Direct constructors such as hashlib.md5 or hashlib.sha256 skip the lookup by
+# name that hashlib.new() has to do each time it is called.
+_DIGEST_CONSTRUCTORS = {
+    name: getattr(hashlib, name)
+    for name in hashlib.algorithms_guaranteed
+    if hasattr(hashlib, name)
+}
+
+
+class _pycryptodome_md5(object):
+
+    """
+    Wrapper for pycryptodome MD5 objects that adds the ``name`` attribute.
+
+    pycryptodome hash objects have the same ``update()`` and ``hexdigest()``
+    methods as the ones from hashlib but lack ``name``, which
+    :class:`written_hash_proxy` and the report printed by :func:`main()`
+    rely on.
+    """
+
+    __slots__ = ('_digest', 'update', 'digest', 'hexdigest')
+
+    name = 'md5'
+
+    def __init__(self, digest):
+        self._digest = digest
+        # Bind the methods once so that calling them costs the same as
+        # calling them on the wrapped object.
+        self.update = digest.update
+        self.digest = digest.digest
+        self.hexdigest = digest.hexdigest
+
+    def copy(self):
+        return _pycryptodome_md5(self._digest.copy())
+
+
+def _fastest_md5():
+    """
+    Pick the fastest available implementation of MD5.
+
+    :returns:
+        Either ``hashlib.md5`` or, if pycryptodome is installed and turns out
+        to be faster on this machine, a factory of :class:`_pycryptodome_md5`.
+
+    Both hash one buffer of :data:`BUFSIZE` bytes a couple of times and the
+    best time of each one is compared.
+    """
+    try:
+        from Crypto.Hash import MD5
+    except ImportError:
+        return hashlib.md5
+    data = bytes(BUFSIZE)
+
+    def pycryptodome_md5():
+        return _pycryptodome_md5(MD5.new())
+
+    def cost(factory):
+        return min(timeit.repeat(
+            lambda: factory().update(data), number=1, repeat=3))
+    return min((hashlib.md5, pycryptodome_md5), key=cost)
+
+
+# OpenSSL implements MD5 in portable, scalar code. Other implementations may
+# do better so the fastest one is selected, but only once MD5 is first used.
+_MD5_FACTORY = None
+
+
+def _md5():
+    """ Create a MD5 digest object with the fastest implementation. """
+    global _MD5_FACTORY
+    # NOTE: concurrent first calls may all run the benchmark, that is
+    # harmless as they all pick a working implementation.
+    if _MD5_FACTORY is None:
+        _MD5_FACTORY = _fastest_md5()
+    return _MD5_FACTORY()
+
+
+_DIGEST_CONSTRUCTORS['md5'] = _md5
+
+# Digests that are not provided by hashlib. The SIMD implementation of BLAKE3
+# is considerably faster than SHA-256, even with SHA extensions, on anything
+# but the shortest inputs. BLAKE2b, always available in hashlib, is the next
+# best thing.
+_EXTRA_DIGESTS = {}
+if blake3 is not None:
+    _EXTRA_DIGESTS['blake3'] = blake3.blake3
+
+
+def new_digest(name):
+    """
+    Create a new digest object.
+
+    :param name:
+        Name of the hashing algorithm to use
+    :returns:
+        A fresh digest object, as returned by ``hashlib.new(name)``. The
+        ``blake3`` digest is supported when the blake3 module is installed.
+    """
+    constructor = _DIGEST_CONSTRUCTORS.get(name) or _EXTRA_DIGESTS.get(name)
+    if constructor is None:
+        return hashlib.new(name)
+    return constructor()
+
 
 class written_hash_proxy(proxy):
 
@@ -67,7 +214,7 @@ class written_hash_proxy(proxy):
         blargh
     """
 
-    def __init__(self, proxiee, name='md5'):
+    def __init__(self, proxiee, name='md5', digest=None):
         """
         Initialize a fresh written_hash_proxy.
 
@@ -75,6 +222,12 @@ class written_hash_proxy(proxy):
             The object that the proxy will wrap (ignored)
         :param name:
             Name of the hashing algorithm to use.
+        :param digest:
+            (optional) An existing digest object to update instead of a new
+            ``hashlib`` object. Anything with the ``update()``,
+            ``hexdigest()`` methods and the ``name`` attribute will do. This
+            allows one to plug in an alternative (for example, a multi-stream
+            SIMD) hashing implementation. If used, ``name`` is ignored.
 
         This method just sets up the desired digest object.
         """
@@ -82,7 +235,12 @@ class written_hash_proxy(proxy):
         # proxy object and store the hash of the data written so far. This
         # state attribute will never clash with anything that the original
         # object happens to have internally.
-        proxy.state(self).digest = hashlib.new(name)
+        state = proxy.state(self)
+        state.digest = new_digest(name) if digest is None else digest
+        # Look up the two methods that write() calls just once. They never
+        # change for the lifetime of the proxy.
+        state.digest_update = state.digest.update
+        state.proxiee_write = proxy.original(self).write
 
     @proxy.direct
     def write(self, data):
@@ -97,41 +255,353 @@ class written_hash_proxy(proxy):
             Whatever the original method raises
 
         This method updates the internal digest object with with the new data
-        and then proceeds to call the original write method.
+        and then proceeds to call the original write method. Both use the
+        buffer protocol so ``data`` can be a ``memoryview`` to avoid copies.
         """
         # Intercept the write method (that's what @direct does) and both write
-        # the data using the original write method (using proxiee(self).write)
-        # and update the hash of the data written so far (using
-        # proxy.state(self).digest).
-        proxy.state(self).digest.update(data)
-        return proxy.original(self).write(data)
+        # the data using the original write method (cached as
+        # proxy.state(self).proxiee_write) and update the hash of the data
+        # written so far (cached as proxy.state(self).digest_update).
+        state = proxy.state(self)
+        state.digest_update(data)
+        return state.proxiee_write(data)
+
+
+class prefetching_reader(object):
+
+    """
+    File-like wrapper that reads from another file in a background thread.
+
+    The wrapped file is read in chunks of ``bufsize`` bytes by a helper
+    thread and at most ``depth`` chunks are kept in memory. This lets the
+    network transfer overlap with hashing and writing done by the consumer.
+    Only the ``readinto()`` method is provided.
+
+    All the chunk buffers are allocated up front and recycled, so no memory
+    is allocated while the data is being read.
+    """
+
+    def __init__(self, reader, bufsize=BUFSIZE, depth=4):
+        """
+        Initialize a prefetching_reader and start the reader thread.
+
+        :param reader:
+            File-like object with a ``readinto()`` method to read from
+        :param bufsize:
+            Number of bytes to read at a time
+        :param depth:
+            Maximum number of chunks that are buffered
+        """
+        # Buffers go around in a circle: from _free to the reader thread, then
+        # to _filled and to the consumer which puts them back in _free.
+        self._free = queue.Queue()
+        self._filled = queue.Queue()
+        for _ in range(depth):
+            self._free.put(bytearray(bufsize))
+        self._chunk = None
+        self._view = memoryview(b'')
+        self._eof = False
+        thread = threading.Thread(target=self._run, args=(reader,))
+        thread.daemon = True
+        thread.start()
+
+    def _run(self, reader):
+        try:
+            while True:
+                chunk = self._free.get()
+                size = reader.readinto(chunk)
+                self._filled.put((chunk, size))
+                if not size:
+                    break
+        except Exception as exc:
+            # Re-raised in the consumer thread by readinto()
+            self._filled.put(exc)
+
+    def readinto(self, buf):
+        """
+        Read data into a pre-allocated buffer.
+
+        :param buf:
+            A writable buffer, typically a bytearray
+        :returns:
+            The number of bytes read, zero at end of file
+        """
+        if not self._view:
+            if self._chunk is not None:
+                self._free.put(self._chunk)
+                self._chunk = None
+            if self._eof:
+                return 0
+            item = self._filled.get()
+            if isinstance(item, Exception):
+                raise item
+            chunk, size = item
+            if not size:
+                self._eof = True
+                return 0
+            self._chunk = chunk
+            self._view = memoryview(chunk)[:size]
+        size = min(len(buf), len(self._view))
+        buf[:size] = self._view[:size]
+        self._view = self._view[size:]
+        return size
+
+
+def copy_stream(reader, stream, bufsize=BUFSIZE):
+    """
+    Copy everything from ``reader`` to ``stream``.
+
+    :param reader:
+        File-like object with a ``readinto()`` method to read from
+    :param stream:
+        File-like object to write to, typically a :class:`written_hash_proxy`
+    :param bufsize:
+        Size of the buffer to use
+    """
+    # Resolve the (possibly intercepted) write method and readinto() once,
+    # outside of the loop.
+    readinto = reader.readinto
+    write = stream.write
+    # Read into one reusable buffer and pass memoryview slices along so that
+    # neither the digest nor the output stream sees a fresh copy of the data
+    # for each chunk.
+    buf = bytearray(bufsize)
+    view = memoryview(buf)
+    while True:
+        size = readinto(buf)
+        if not size:
+            break
+        # Most reads fill the whole buffer, don't create a slice for those.
+        write(view if size == bufsize else view[:size])
+
+
+def hash_and_copy(reader, stream, name, bufsize=BUFSIZE):
+    """
+    Copy everything from ``reader`` to ``stream`` and hash it along the way.
+
+    :param reader:
+        File-like object with a ``readinto()`` method to read from
+    :param stream:
+        File-like object to write to
+    :param name:
+        Name of the hashing algorithm to use
+    :param bufsize:
+        Size of the buffer to use
+    :returns:
+        The digest object of all the copied data
+
+    This is what :class:`written_hash_proxy` does, minus the proxy. It is
+    useful when nothing else needs to observe the writes as it avoids going
+    through the intercepted write method for each chunk.
+    """
+    digest = new_digest(name)
+    # Bind the three methods called for each chunk just once.
+    readinto = reader.readinto
+    write = stream.write
+    update = digest.update
+    buf = bytearray(bufsize)
+    view = memoryview(buf)
+    while True:
+        size = readinto(buf)
+        if not size:
+            break
+        chunk = view if size == bufsize else view[:size]
+        write(chunk)
+        update(chunk)
+    return digest
+
+
+def _regular_file_fd(obj):
+    """
+    Get the file descriptor of a file-like object backed by a regular file.
+
+    :param obj:
+        Any file-like object
+    :returns:
+        The file descriptor or None if ``obj`` doesn't have one or if the
+        descriptor refers to something other than a regular file (a socket,
+        a pipe, a terminal and so on).
+    """
+    try:
+        fd = obj.fileno()
+    except (AttributeError, OSError, ValueError):
+        # NOTE: io.UnsupportedOperation is a subclass of both
+        return None
+    if not stat.S_ISREG(os.fstat(fd).st_mode):
+        return None
+    return fd
+
+
+def sendfile_and_hash(reader, stream, name, bufsize=BUFSIZE):
+    """
+    Copy ``reader`` to ``stream`` inside the kernel and hash the copy.
+
+    :param reader:
+        File-like object to read from
+    :param stream:
+        File-like object to write to, it must have a ``name``
+    :param name:
+        Name of the hashing algorithm to use
+    :param bufsize:
+        Size of the buffer to use for hashing
+    :returns:
+        The digest object of all the copied data or None if both ``reader``
+        and ``stream`` are not regular files and nothing was done.
+
+    The data is copied with ``os.sendfile()`` so it is never seen by this
+    process. The copied part of the output file is then read back to compute
+    the digest. This is only possible when the input is a local file (e.g. a
+    ``file://`` URL) and the output is a local file, too.
+    """
+    if not hasattr(os, 'sendfile'):
+        return None
+    in_fd = _regular_file_fd(reader)
+    out_fd = _regular_file_fd(stream)
+    if in_fd is None or out_fd is None:
+        return None
+    stream.flush()
+    # The output may already hold the data of other URLs, only the part
+    # written here is hashed.
+    start = os.lseek(out_fd, 0, os.SEEK_CUR)
+    # NOTE: With offset set to None sendfile() starts at, and advances, the
+    # current position of in_fd. Nothing was read from the reader yet so
+    # there is no data that would be stuck in its buffers.
+    remaining = os.fstat(in_fd).st_size
+    copied = 0
+    while True:
+        sent = os.sendfile(out_fd, in_fd, None, max(remaining, bufsize))
+        if not sent:
+            break
+        remaining -= sent
+        copied += sent
+    digest = new_digest(name)
+    buf = bytearray(bufsize)
+    view = memoryview(buf)
+    with open(stream.name, 'rb') as copy:
+        copy.seek(start)
+        while copied:
+            size = copy.readinto(view[:min(copied, bufsize)])
+            if not size:
+                break
+            digest.update(view[:size])
+            copied -= size
+    return digest
+
+
+def checksum_url(url, output, name, intercept=False, prefetch=False):
+    """
+    Retrieve the content of an URL, write it to a file and hash it.
+
+    :param url:
+        URL to load
+    :param output:
+        Binary file-like object to write the retrieved content to
+    :param name:
+        Name of the hashing algorithm to use
+    :param intercept:
+        If True, always hash the data through ``written_hash_proxy``
+    :param prefetch:
+        If True, read from the network in a separate thread
+    :returns:
+        The digest object of the retrieved content
+    """
+    reader = requestlib.urlopen(requestlib.Request(url))
+    if prefetch:
+        reader = prefetching_reader(reader)
+    # The proxy is only really needed to substitute standard output, as
+    # explained in the documentation of written_hash_proxy. When writing to
+    # a file the data can be hashed and copied directly.
+    if intercept or output is sys.stdout.buffer:
+        stream = written_hash_proxy(output, name=name)
+        copy_stream(reader, stream)
+        stream.flush()
+        return proxy.state(stream).digest
+    digest = sendfile_and_hash(reader, output, name)
+    if digest is None:
+        digest = hash_and_copy(reader, output, name)
+    output.flush()
+    return digest
+
+
+def _output_names(urls):
+    """
+    Get the names of the files where --parallel-hash saves each URL.
+
+    :param urls:
+        List of URLs to save
+    :returns:
+        A list of distinct file names, one for each URL
+
+    Each URL is saved to ``BASENAME.out``, where an empty basename is replaced
+    by ``index``. URLs that would end up in a file that is already taken get
+    a numeric suffix instead, as in ``BASENAME-2.out``. This way no two
+    threads ever write to the same file.
+    """
+    names = []
+    taken = set()
+    for url in urls:
+        basename = posixpath.basename(parselib.urlsplit(url).path) or 'index'
+        name = '{}.out'.format(basename)
+        suffix = 1
+        while name in taken:
+            suffix += 1
+            name = '{}-{}.out'.format(basename, suffix)
+        taken.add(name)
+        names.append(name)
+    return names
+
+
+def _checksum_url_to_file(url, filename, name, intercept, prefetch):
+    """ Run checksum_url() on a separate output file of a given URL. """
+    with open(filename, 'wb', BUFSIZE) as output:
+        return checksum_url(url, output, name, intercept, prefetch)
 
 
 def main():
     """ Main function of this example. """
     parser = argparse.ArgumentParser()
     parser.add_argument(
-        '--digest', default="md5", help="Digest to use",
-        choices=sorted(
-            getattr(hashlib, 'algorithms', None)
-            or hashlib.algorithms_available))
+        '--digest', default=DEFAULT_DIGEST,
+        help="Digest to use (blake3 or blake2b are the fastest)",
+        choices=sorted(hashlib.algorithms_available | set(_EXTRA_DIGESTS)))
+    parser.add_argument(
+        '--url', nargs='+', default=["http://example.org"], metavar='URL',
+        help="URL(s) to load")
     parser.add_argument(
-        '--url', default="http://example.org", help="URL to load")
+        '-o', '--output', type=argparse.FileType('wb', BUFSIZE),
+        metavar='FILE', default='-',
+        help="Where to write the retrieved conentent")
     parser.add_argument(
-        '-o', '--output', type=argparse.FileType('wb'), metavar='FILE',
-        default='-', help="Where to write the retrieved conentent")
+        '--intercept', action='store_true',
+        help="Always hash the data through written_hash_proxy")
+    parser.add_argument(
+        '--prefetch', action='store_true',
+        help="Read from the network in a separate thread")
+    parser.add_argument(
+        '--parallel-hash', action='store_true',
+        help="Process all URLs concurrently, saving each one to BASENAME.out"
+        " (or BASENAME-N.out if that name is already taken)")
     opts = parser.parse_args()
-    request = requestlib.Request(opts.url)
-    reader = requestlib.urlopen(request)
-    stream = written_hash_proxy(
-        opts.output.buffer if hasattr(opts.output, 'buffer') else opts.output,
-        name=opts.digest)
-    for chunk in reader:
-        stream.write(chunk)
-    stream.flush()
-    print("{} of {} is {}".format(
-        proxy.state(stream).digest.name, opts.url,
-        proxy.state(stream).digest.hexdigest()))
+    output = (
+        opts.output.buffer if hasattr(opts.output, 'buffer') else opts.output)
+    if opts.parallel_hash:
+        if output is not sys.stdout.buffer:
+            parser.error("--output cannot be used with --parallel-hash")
+        # hashlib releases the GIL while hashing large chunks (and so does
+        # all the I/O) so the threads genuinely run in parallel.
+        with futures.ThreadPoolExecutor(os.cpu_count()) as executor:
+            job = functools.partial(
+                _checksum_url_to_file, name=opts.digest,
+                intercept=opts.intercept, prefetch=opts.prefetch)
+            digests = list(
+                executor.map(job, opts.url, _output_names(opts.url)))
+    else:
+        digests = [
+            checksum_url(url, output, opts.digest, opts.intercept,
+                         opts.prefetch)
+            for url in opts.url]
+    for url, digest in zip(opts.url, digests):
+        print("{} of {} is {}".format(digest.name, url, digest.hexdigest()))
 
 
 if __name__ == '__main__':
@@ -177,6 +177,14 @@ introduction.
     interface is the :class:`proxy` class and the :meth:`proxy.direct`
     decorator.  See below for examples.
 
+Debugging
+---------
+
+Padme logs each forwarded operation to the ``padme`` logger at the ``DEBUG``
+level. Since that is costly, the messages are only generated if the logger
+is enabled for ``DEBUG`` at the time padme is imported or if the
+``PADME_DEBUG`` environment variable is set to a non-empty value.
+
 Deprecated 1.0 APIs
 -------------------
 
@@ -189,7 +197,9 @@ from __future__ import print_function, absolute_import, unicode_literals
 
 import logging
 import operator
+import os
 import sys
+import threading
 
 __author__ = 'Zygmunt Krynicki'
 __email__ = 'zygmunt.krynicki@canonical.com'
@@ -198,6 +208,20 @@ __all__ = (str('proxy'), )
 
 _logger = logging.getLogger("padme")
 
+# Every forwarded operation has a debug message. Calling _logger.debug() for
+# each one is expensive even when nothing is logged, so all of those calls are
+# guarded by this flag. It is computed once, on import, so to see the messages
+# either set PADME_DEBUG in the environment or configure logging before
+# importing padme (or set this to True afterwards).
+_DEBUG = (
+    bool(os.environ.get('PADME_DEBUG'))
+    or _logger.isEnabledFor(logging.DEBUG))
+
+_EMPTY = frozenset()
+
+# Serializes the creation of proxy_state objects, see proxy.state().
+_state_lock = threading.Lock()
+
 
 class proxy_meta(type):
 
@@ -208,46 +232,79 @@ class proxy_meta(type):
     on each created class. The attribute is a frozenset of names that will not
     be forwarded to the ``proxiee`` but instead will be looked up on the proxy
     itself.
+
+    Each class also gets the ``__intercepted__`` attribute, a frozenset of
+    ``__unproxied__`` and the names of all augmented assignment methods. Any
+    name not in that set is simply forwarded to the ``proxiee``.
+
+    Typed proxy classes get empty ``__slots__`` so that they don't add an
+    instance dictionary to their base class. Subclasses of :class:`proxy`
+    defined by users keep the usual Python semantics.
     """
 
     def __new__(mcls, name, bases, ns, *args, **kwargs):
-        _logger.debug(
-            "%s.__new__ with name: %r, bases: %r (args: %r, kwargs %r)",
-            mcls.__name__, name, bases, args, kwargs)
-        unproxied_set = set()
-        for base in bases:
-            if hasattr(base, '__unproxied__'):
-                unproxied_set.update(base.__unproxied__)
-        for ns_attr, ns_value in ns.items():
-            if getattr(ns_value, 'unproxied', False):
-                unproxied_set.add(ns_attr)
-        if unproxied_set:
+        if _DEBUG:
+            _logger.debug(
+                "%s.__new__ with name: %r, bases: %r (args: %r, kwargs %r)",
+                mcls.__name__, name, bases, args, kwargs)
+        # NOTE: each class created by proxy_meta has its own __unproxied__ so
+        # there is no need to look for it anywhere but in the base __dict__.
+        base_sets = [
+            base.__dict__.get('__unproxied__', _EMPTY) for base in bases]
+        own_names = [
+            ns_attr for ns_attr, ns_value in ns.items()
+            if getattr(ns_value, 'unproxied', False)]
+        if not own_names and len(base_sets) == 1:
+            # This is always the case for typed proxy classes, the frozenset
+            # can be shared with the base class.
+            unproxied_set = base_sets[0]
+        else:
+            unproxied_set = _EMPTY.union(own_names, *base_sets)
+        if _DEBUG and unproxied_set:
             _logger.debug(
                 "proxy type %r will pass-thru %r", name, unproxied_set)
-        ns['__unproxied__'] = frozenset(unproxied_set)
+        ns['__unproxied__'] = unproxied_set
+        ns['__intercepted__'] = ns['__unproxied__'] | _imethods
         # _logger.debug("injecting fresh _c_registry into %s", name)
         ns['_c_registry'] = {}
+        # Only typed proxy classes, see __getitem__ below, are bound to a
+        # particular class of proxiee objects.
+        ns.setdefault('_proxiee_cls', None)
         cls = super(proxy_meta, mcls).__new__(mcls, name, bases, ns)
-        cls._untyped_base = cls
+        if '_untyped_base' not in ns:
+            # Typed proxy classes pass the untyped class in ns, everything
+            # else is untyped.
+            cls._untyped_base = cls
         return cls
 
     def __getitem__(proxy_cls, proxiee_cls):
         proxy_cls = proxy_cls._untyped_base
         if not isinstance(proxiee_cls, type):
             raise ValueError("proxiee_cls must be a type")
-        if proxiee_cls not in proxy_cls._m_registry:
-            typed_proxy_meta = make_typed_proxy_meta(proxiee_cls)
-            proxy_cls._m_registry[proxiee_cls] = typed_proxy_meta
-        else:
-            typed_proxy_meta = proxy_cls._m_registry[proxiee_cls]
-        if proxiee_cls not in proxy_cls._c_registry:
-            typed_proxy_cls = metaclass(typed_proxy_meta)(
-                proxy_cls, str('{}[{}]').format(
-                    proxy_cls.__name__, proxiee_cls.__name__))
-            proxy_cls._c_registry[proxiee_cls] = typed_proxy_cls
-        else:
+        try:
             typed_proxy_cls = proxy_cls._c_registry[proxiee_cls]
-        typed_proxy_cls._untyped_base = proxy_cls
+        except KeyError:
+            # The meta-class is only needed to create a new typed proxy class.
+            # NOTE: two threads may both get here for the same proxiee_cls.
+            # Both registries are only updated with setdefault() so that
+            # everyone ends up using whatever was stored first.
+            try:
+                typed_proxy_meta = proxy_cls._m_registry[proxiee_cls]
+            except KeyError:
+                typed_proxy_meta = proxy_cls._m_registry.setdefault(
+                    proxiee_cls, make_typed_proxy_meta(proxiee_cls))
+            # NOTE: this is what metaclass(typed_proxy_meta)(proxy_cls, name)
+            # would do, without going through the decorator.
+            typed_proxy_cls = proxy_cls._c_registry.setdefault(
+                proxiee_cls, typed_proxy_meta(
+                    str('{}[{}]').format(
+                        proxy_cls.__name__, proxiee_cls.__name__),
+                    (proxy_cls,), {
+                        '__doc__': proxy_cls.__doc__,
+                        '_proxiee_cls': proxiee_cls,
+                        '_untyped_base': proxy_cls,
+                        '__slots__': (),
+                    }))
         return typed_proxy_cls
 
 
@@ -271,13 +328,15 @@ def make_typed_proxy_meta(proxiee_cls):
     def __instancecheck__(mcls, instance):
         # NOTE: this is never called in practice since
         # proxy(obj).__class__ is really obj.__class__.
-        _logger.debug("__instancecheck__ %r on %r", instance, proxiee_cls)
+        if _DEBUG:
+            _logger.debug("__instancecheck__ %r on %r", instance, proxiee_cls)
         return isinstance(instance, proxiee_cls)
 
     def __subclasscheck__(mcls, subclass):
         # This is still called though since type(proxy(obj)) is
         # something else
-        _logger.debug("__subclasscheck__ %r on %r", subclass, proxiee_cls)
+        if _DEBUG:
+            _logger.debug("__subclasscheck__ %r on %r", subclass, proxiee_cls)
         return issubclass(proxiee_cls, subclass)
 
     name = str('proxy_meta[{}]').format(proxiee_cls.__name__)
@@ -295,18 +354,6 @@ def make_typed_proxy_meta(proxiee_cls):
     return proxy_meta(name, bases, ns)
 
 
-def _get_proxiee(proxy_obj):
-    return object.__getattribute__(proxy_obj, '_original')
-
-
-def _set_proxiee(proxy_obj, proxiee):
-    return object.__setattr__(proxy_obj, '_original', proxiee)
-
-
-def _get_unproxied(proxy):
-    return type(proxy).__unproxied__
-
-
 # All augmented assignment methods. We need to know those to let use intercept
 # __getattribute__ access to them. Normally it is safe to directly call methods
 # on the original object but augmented assignment a (op)= b actually changes a
@@ -330,36 +377,52 @@ if sys.version_info[0] == 2:
 
 _imethods = frozenset(_imethods)
 
+# Operators without a syntax that works everywhere (or at all). Those are
+# called through the operator module, keeping them as globals saves looking
+# each one up on the module in every call.
+_truediv = operator.truediv
+_index = operator.index
+if sys.version_info[0:2] >= (3, 5):
+    _matmul = operator.matmul
+if sys.version_info[0] == 2:
+    _div = operator.div
+
 
-def _imethod(self, other, name, op):
+def _make_imethod(name, op):
     """
-    Shared implementation of __iFUNC__ method.
+    Make an __iFUNC__ method.
 
-    :param self:
-        A proxy_base instance
-    :param other:
-        Any right-hand-side value
     :param name:
         Name of the __iFUNC__
     :param op:
         Appropriate operator.__iFUNC__ operator
     :returns:
-        self
+        A method that applies ``op`` to the proxiee and ``other`` and returns
+        either self or, if needed, a new proxy
     """
-    proxiee_old = proxiee_new = _get_proxiee(self)
-    _logger.debug("%s on proxiee (%r)", name, proxiee_old)
-    # NOTE: This _may_ or _may not be_ calling __iFUNC__
-    # as the proxiee may not support it in the first place
-    proxiee_new = op(proxiee_old, other)
-    if proxiee_new is not proxiee_old:
-        # NOTE: all of the augmented assignment methods handle the case where
-        # the __iFUNC__ method returns something other than self. To maintain
-        # the illusion that the proxy is not there the internal proxiee
-        # reference is changed to the new proxiee.
-        _logger.debug("%s creates new %s (%r)",
-                      name, type(self).__name__, proxiee_new)
-        return type(self)(proxiee_new)
-    return self
+    def imethod(self, other):
+        proxiee_old = _get_proxiee(self)
+        if _DEBUG:
+            _logger.debug("%s on proxiee (%r)", name, proxiee_old)
+        # NOTE: This _may_ or _may not be_ calling __iFUNC__
+        # as the proxiee may not support it in the first place
+        proxiee_new = op(proxiee_old, other)
+        if proxiee_new is not proxiee_old:
+            # NOTE: all of the augmented assignment methods handle the case
+            # where the __iFUNC__ method returns something other than self. To
+            # maintain the illusion that the proxy is not there the internal
+            # proxiee reference is changed to the new proxiee.
+            if _DEBUG:
+                _logger.debug("%s creates new %s (%r)",
+                              name, type(self).__name__, proxiee_new)
+            return type(self)(proxiee_new)
+        return self
+    imethod.__name__ = str(name)
+    return imethod
+
+
+# __ipow__ takes an extra argument, see proxy_base.__ipow__ below.
+_ipow = _make_imethod('__ipow__', operator.ipow)
 
 
 class proxy_base(object):
@@ -369,14 +432,13 @@ class proxy_base(object):
 
     This class implements the bulk of the proxy work by having a lot of dunder
     methods that delegate their work to a ``proxiee`` object. The ``proxiee``
-    object must be available as the ``__proxiee__`` attribute on a class
-    deriving from ``base_proxy``. Apart from ``__proxiee__`, the
-    ``__unproxied__`` attribute, which should be a frozenset, must also be
-    present in all derived classes.
+    object is kept in the ``_original`` slot of each instance. Apart from
+    that, the ``__unproxied__`` attribute, which should be a frozenset, must
+    also be present in all derived classes.
 
-    In practice, the two special attributes are injected via
-    ``boundproxy_meta`` created by :func:`make_boundproxy_meta()`. This class
-    is also used as a base class for the tricky :class:`proxy` below.
+    In practice, the ``__unproxied__`` attribute is injected by
+    :class:`proxy_meta`. This class is also used as a base class for the
+    tricky :class:`proxy` below.
 
     NOTE: Look at ``pydoc3 SPECIALMETHODS`` section titled ``Special method
     lookup`` for a rationale of why we have all those dunder methods while
@@ -389,6 +451,12 @@ class proxy_base(object):
     # makes no sense on instances. Proxy is designed to intercept access to
     # *objects*, not construction of such objects in the first place.
 
+    # The proxiee lives in a slot so that it can be read with a C-level
+    # descriptor, see _get_proxiee() below. Everything else a proxy may need
+    # is kept in the proxy_state object, created on demand and remembered in
+    # the _state slot. Proxies don't have an instance dictionary.
+    __slots__ = ('_original', '_state', '__weakref__')
+
     # N/A to instances: __new__
 
     # N/A to instances: __init__
@@ -405,52 +473,62 @@ class proxy_base(object):
 
     def __repr__(self):
         proxiee = _get_proxiee(self)
-        _logger.debug("__repr__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__repr__ on proxiee (%r)", proxiee)
         return repr(proxiee)
 
     def __str__(self):
         proxiee = _get_proxiee(self)
-        _logger.debug("__str__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__str__ on proxiee (%r)", proxiee)
         return str(proxiee)
 
     def __bytes__(self):
         proxiee = _get_proxiee(self)
-        _logger.debug("__bytes__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__bytes__ on proxiee (%r)", proxiee)
         return bytes(proxiee)
 
     def __format__(self, format_spec):
         proxiee = _get_proxiee(self)
-        _logger.debug("__format__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__format__ on proxiee (%r)", proxiee)
         return format(proxiee, format_spec)
 
     def __lt__(self, other):
         proxiee = _get_proxiee(self)
-        _logger.debug("__lt__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__lt__ on proxiee (%r)", proxiee)
         return proxiee < other
 
     def __le__(self, other):
         proxiee = _get_proxiee(self)
-        _logger.debug("__le__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__le__ on proxiee (%r)", proxiee)
         return proxiee <= other
 
     def __eq__(self, other):
         proxiee = _get_proxiee(self)
-        _logger.debug("__eq__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__eq__ on proxiee (%r)", proxiee)
         return proxiee == other
 
     def __ne__(self, other):
         proxiee = _get_proxiee(self)
-        _logger.debug("__ne__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__ne__ on proxiee (%r)", proxiee)
         return proxiee != other
 
     def __gt__(self, other):
         proxiee = _get_proxiee(self)
-        _logger.debug("__gt__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__gt__ on proxiee (%r)", proxiee)
         return proxiee > other
 
     def __ge__(self, other):
         proxiee = _get_proxiee(self)
-        _logger.debug("__ge__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__ge__ on proxiee (%r)", proxiee)
         return proxiee >= other
 
     if sys.version_info[0] == 2:
@@ -458,12 +536,14 @@ class proxy_base(object):
         # __getattribute__ already
         def __cmp__(self, other):
             proxiee = _get_proxiee(self)
-            _logger.debug("__cmp__ on proxiee (%r)", proxiee)
+            if _DEBUG:
+                _logger.debug("__cmp__ on proxiee (%r)", proxiee)
             return cmp(proxiee, other)
 
     def __hash__(self):
         proxiee = _get_proxiee(self)
-        _logger.debug("__hash__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__hash__ on proxiee (%r)", proxiee)
         return hash(proxiee)
 
     # NOTE: __bool__ is spelled as __nonzero__ in pre-3K world
@@ -471,127 +551,157 @@ class proxy_base(object):
     if sys.version_info[0] == 3:
         def __bool__(self):
             proxiee = _get_proxiee(self)
-            _logger.debug("__bool__ on proxiee (%r)", proxiee)
+            if _DEBUG:
+                _logger.debug("__bool__ on proxiee (%r)", proxiee)
             return bool(proxiee)
     else:
         def __nonzero__(self):
             proxiee = _get_proxiee(self)
-            _logger.debug("__nonzero__ on proxiee (%r)", proxiee)
+            if _DEBUG:
+                _logger.debug("__nonzero__ on proxiee (%r)", proxiee)
             return bool(proxiee)
 
     if sys.version_info[0] == 2:
         def __unicode__(self):
             proxiee = _get_proxiee(self)
-            _logger.debug("__unicode__ on proxiee (%r)", proxiee)
+            if _DEBUG:
+                _logger.debug("__unicode__ on proxiee (%r)", proxiee)
             return unicode(proxiee)
 
     def __getattr__(self, name):
         proxiee = _get_proxiee(self)
-        _logger.debug("__getattr__ %r on proxiee (%r)", name, proxiee)
+        if _DEBUG:
+            _logger.debug("__getattr__ %r on proxiee (%r)", name, proxiee)
         return getattr(proxiee, name)
 
     def __getattribute__(self, name):
-        is_unproxied = name in _get_unproxied(self)
-        is_imethod = name in _imethods
-        if is_unproxied:
-            _logger.debug("%s.__getattribute__ %r on proxy itself (direct)",
-                          type(self).__name__, name)
-            return object.__getattribute__(self, name)
-        elif is_imethod:
-            _logger.debug(
-                "%s.__getattribute__ %r on proxy itself (augmented"
-                " assignment)", type(self).__name__, name)
+        # NOTE: __getattribute__ cannot be replaced by __getattr__ alone.
+        # Attributes found on the proxy class (most notably __class__, which
+        # makes isinstance() work, but also all the dunder methods defined
+        # here) would never reach the proxiee then. Instead, the common case
+        # of forwarding is decided with a single membership test.
+        cls = type(self)
+        if name not in cls.__intercepted__:
             proxiee = _get_proxiee(self)
-            object.__getattribute__(proxiee, name)
+            if _DEBUG:
+                _logger.debug("%s.__getattribute__ %r on proxiee (%r)",
+                              cls.__name__, name, proxiee)
+            return getattr(proxiee, name)
+        elif name in cls.__unproxied__:
+            if _DEBUG:
+                _logger.debug(
+                    "%s.__getattribute__ %r on proxy itself (direct)",
+                    cls.__name__, name)
             return object.__getattribute__(self, name)
         else:
+            # name is one of _imethods
+            if _DEBUG:
+                _logger.debug(
+                    "%s.__getattribute__ %r on proxy itself (augmented"
+                    " assignment)", cls.__name__, name)
             proxiee = _get_proxiee(self)
-            _logger.debug("%s.__getattribute__ %r on proxiee (%r)",
-                          type(self).__name__, name, proxiee)
-            return getattr(proxiee, name)
+            object.__getattribute__(proxiee, name)
+            return object.__getattribute__(self, name)
 
     def __setattr__(self, name, value):
-        if name not in _get_unproxied(self):
+        if name not in type(self).__unproxied__:
             proxiee = _get_proxiee(self)
-            _logger.debug("__setattr__ %r on proxiee (%r)", name, proxiee)
+            if _DEBUG:
+                _logger.debug("__setattr__ %r on proxiee (%r)", name, proxiee)
             setattr(proxiee, name, value)
         else:
-            _logger.debug("__setattr__ %r on proxy itself (direct)", name)
+            if _DEBUG:
+                _logger.debug("__setattr__ %r on proxy itself (direct)", name)
             object.__setattr__(self, name, value)
 
     def __delattr__(self, name):
-        if name not in _get_unproxied(self):
+        if name not in type(self).__unproxied__:
             proxiee = _get_proxiee(self)
-            _logger.debug("__delattr__ %r on proxiee (%r)", name, proxiee)
+            if _DEBUG:
+                _logger.debug("__delattr__ %r on proxiee (%r)", name, proxiee)
             delattr(proxiee, name)
         else:
-            _logger.debug("__delattr__ %r on proxy itself (direct)", name)
+            if _DEBUG:
+                _logger.debug("__delattr__ %r on proxy itself (direct)", name)
             object.__delattr__(self, name)
 
     def __dir__(self):
         proxiee = _get_proxiee(self)
-        _logger.debug("__dir__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__dir__ on proxiee (%r)", proxiee)
         return dir(proxiee)
 
     def __get__(self, instance, owner):
         proxiee = _get_proxiee(self)
-        _logger.debug("__get__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__get__ on proxiee (%r)", proxiee)
         return proxiee.__get__(instance, owner)
 
     def __set__(self, instance, value):
         proxiee = _get_proxiee(self)
-        _logger.debug("__set__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__set__ on proxiee (%r)", proxiee)
         proxiee.__set__(instance, value)
 
     def __delete__(self, instance):
         proxiee = _get_proxiee(self)
-        _logger.debug("__delete__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__delete__ on proxiee (%r)", proxiee)
         proxiee.__delete__(instance)
 
     def __call__(self, *args, **kwargs):
         proxiee = _get_proxiee(self)
-        _logger.debug("__call__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__call__ on proxiee (%r)", proxiee)
         return proxiee(*args, **kwargs)
 
     def __len__(self):
         proxiee = _get_proxiee(self)
-        _logger.debug("__len__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__len__ on proxiee (%r)", proxiee)
         return len(proxiee)
 
     if sys.version_info[0:2] >= (3, 4):
         def __length_hint__(self):
             proxiee = _get_proxiee(self)
-            _logger.debug("__length_hint__ on proxiee (%r)", proxiee)
+            if _DEBUG:
+                _logger.debug("__length_hint__ on proxiee (%r)", proxiee)
             return proxiee.__length_hint__()
 
     def __getitem__(self, item):
         proxiee = _get_proxiee(self)
-        _logger.debug("__getitem__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__getitem__ on proxiee (%r)", proxiee)
         return proxiee[item]
 
     def __setitem__(self, item, value):
         proxiee = _get_proxiee(self)
-        _logger.debug("__setitem__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__setitem__ on proxiee (%r)", proxiee)
         proxiee[item] = value
 
     def __delitem__(self, item):
         proxiee = _get_proxiee(self)
-        _logger.debug("__delitem__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__delitem__ on proxiee (%r)", proxiee)
         del proxiee[item]
 
     def __iter__(self):
         proxiee = _get_proxiee(self)
-        _logger.debug("__iter__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__iter__ on proxiee (%r)", proxiee)
         return iter(proxiee)
 
     def __reversed__(self):
         proxiee = _get_proxiee(self)
-        _logger.debug("__reversed__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__reversed__ on proxiee (%r)", proxiee)
         return reversed(proxiee)
 
     def __contains__(self, item):
         proxiee = _get_proxiee(self)
-        _logger.debug("__contains__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__contains__ on proxiee (%r)", proxiee)
         return item in proxiee
 
     # NOTE: __{get,set,del}slice__() methods are not implemented as they are
@@ -601,295 +711,328 @@ class proxy_base(object):
 
     def __add__(self, other):
         proxiee = _get_proxiee(self)
-        _logger.debug("__add__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__add__ on proxiee (%r)", proxiee)
         return proxiee + other
 
     def __sub__(self, other):
         proxiee = _get_proxiee(self)
-        _logger.debug("__sub__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__sub__ on proxiee (%r)", proxiee)
         return proxiee - other
 
     def __mul__(self, other):
         proxiee = _get_proxiee(self)
-        _logger.debug("__mul__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__mul__ on proxiee (%r)", proxiee)
         return proxiee * other
 
     if sys.version_info[0:2] >= (3, 5):
         def __matmul__(self, other):
             proxiee = _get_proxiee(self)
-            _logger.debug("__matmul__ on proxiee (%r)", proxiee)
+            if _DEBUG:
+                _logger.debug("__matmul__ on proxiee (%r)", proxiee)
             # NOTE: this is equivalent to ``proxiee @ other`` but we cannot use
             # this syntax as long as 3.4 and earlier have to be supported.
-            return operator.matmul(proxiee, other)
+            return _matmul(proxiee, other)
 
     if sys.version_info[0] == 2:
         def __div__(self, other):
             proxiee = _get_proxiee(self)
-            _logger.debug("__div__ on proxiee (%r)", proxiee)
-            return operator.div(proxiee, other)
+            if _DEBUG:
+                _logger.debug("__div__ on proxiee (%r)", proxiee)
+            return _div(proxiee, other)
 
     def __truediv__(self, other):
         proxiee = _get_proxiee(self)
-        _logger.debug("__truediv__ on proxiee (%r)", proxiee)
-        return operator.truediv(proxiee, other)
+        if _DEBUG:
+            _logger.debug("__truediv__ on proxiee (%r)", proxiee)
+        return _truediv(proxiee, other)
 
     def __floordiv__(self, other):
         proxiee = _get_proxiee(self)
-        _logger.debug("__floordiv__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__floordiv__ on proxiee (%r)", proxiee)
         return proxiee // other
 
     def __mod__(self, other):
         proxiee = _get_proxiee(self)
-        _logger.debug("__mod__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__mod__ on proxiee (%r)", proxiee)
         return proxiee % other
 
     def __divmod__(self, other):
         proxiee = _get_proxiee(self)
-        _logger.debug("__divmod__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__divmod__ on proxiee (%r)", proxiee)
         return divmod(proxiee, other)
 
     def __pow__(self, other, modulo=None):
         proxiee = _get_proxiee(self)
-        _logger.debug("__pow__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__pow__ on proxiee (%r)", proxiee)
         return pow(proxiee, other, modulo)
 
     def __lshift__(self, other):
         proxiee = _get_proxiee(self)
-        _logger.debug("__lshift__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__lshift__ on proxiee (%r)", proxiee)
         return proxiee << other
 
     def __rshift__(self, other):
         proxiee = _get_proxiee(self)
-        _logger.debug("__rshift__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__rshift__ on proxiee (%r)", proxiee)
         return proxiee >> other
 
     def __and__(self, other):
         proxiee = _get_proxiee(self)
-        _logger.debug("__and__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__and__ on proxiee (%r)", proxiee)
         return proxiee & other
 
     def __xor__(self, other):
         proxiee = _get_proxiee(self)
-        _logger.debug("__xor__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__xor__ on proxiee (%r)", proxiee)
         return proxiee ^ other
 
     def __or__(self, other):
         proxiee = _get_proxiee(self)
-        _logger.debug("__or__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__or__ on proxiee (%r)", proxiee)
         return proxiee | other
 
     # all reversed numeric methods
 
     def __radd__(self, other):
         proxiee = _get_proxiee(self)
-        _logger.debug("__radd__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__radd__ on proxiee (%r)", proxiee)
         return other + proxiee
 
     def __rsub__(self, other):
         proxiee = _get_proxiee(self)
-        _logger.debug("__rsub__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__rsub__ on proxiee (%r)", proxiee)
         return other - proxiee
 
     def __rmul__(self, other):
         proxiee = _get_proxiee(self)
-        _logger.debug("__rmul__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__rmul__ on proxiee (%r)", proxiee)
         return other * proxiee
 
     if sys.version_info[0:2] >= (3, 5):
         def __rmatmul__(self, other):
             proxiee = _get_proxiee(self)
-            _logger.debug("__rmatmul__ on proxiee (%r)", proxiee)
+            if _DEBUG:
+                _logger.debug("__rmatmul__ on proxiee (%r)", proxiee)
             # NOTE: this is equivalent to ``proxiee @ other`` but we cannot use
             # this syntax as long as 3.4 and earlier have to be supported.
-            return operator.matmul(other, proxiee)
+            return _matmul(other, proxiee)
 
     if sys.version_info[0] == 2:
         def __rdiv__(self, other):
             proxiee = _get_proxiee(self)
-            _logger.debug("__rdiv__ on proxiee (%r)", proxiee)
-            return operator.__div__(other, proxiee)
+            if _DEBUG:
+                _logger.debug("__rdiv__ on proxiee (%r)", proxiee)
+            return _div(other, proxiee)
 
     def __rtruediv__(self, other):
         proxiee = _get_proxiee(self)
-        _logger.debug("__rtruediv__ on proxiee (%r)", proxiee)
-        return operator.__truediv__(other, proxiee)
+        if _DEBUG:
+            _logger.debug("__rtruediv__ on proxiee (%r)", proxiee)
+        return _truediv(other, proxiee)
 
     def __rfloordiv__(self, other):
         proxiee = _get_proxiee(self)
-        _logger.debug("__rfloordiv__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__rfloordiv__ on proxiee (%r)", proxiee)
         return other // proxiee
 
     def __rmod__(self, other):
         proxiee = _get_proxiee(self)
-        _logger.debug("__rmod__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__rmod__ on proxiee (%r)", proxiee)
         return other % proxiee
 
     def __rdivmod__(self, other):
         proxiee = _get_proxiee(self)
-        _logger.debug("__rdivmod__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__rdivmod__ on proxiee (%r)", proxiee)
         return divmod(other, proxiee)
 
     def __rpow__(self, other):
         proxiee = _get_proxiee(self)
-        _logger.debug("__rpow__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__rpow__ on proxiee (%r)", proxiee)
         return pow(other, proxiee)
 
     def __rlshift__(self, other):
         proxiee = _get_proxiee(self)
-        _logger.debug("__rlshift__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__rlshift__ on proxiee (%r)", proxiee)
         return other << proxiee
 
     def __rrshift__(self, other):
         proxiee = _get_proxiee(self)
-        _logger.debug("__rrshift__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__rrshift__ on proxiee (%r)", proxiee)
         return other >> proxiee
 
     def __rand__(self, other):
         proxiee = _get_proxiee(self)
-        _logger.debug("__rand__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__rand__ on proxiee (%r)", proxiee)
         return other & proxiee
 
     def __rxor__(self, other):
         proxiee = _get_proxiee(self)
-        _logger.debug("__rxor__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__rxor__ on proxiee (%r)", proxiee)
         return other ^ proxiee
 
     def __ror__(self, other):
         proxiee = _get_proxiee(self)
-        _logger.debug("__rrshift__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__rrshift__ on proxiee (%r)", proxiee)
         return other | proxiee
 
     # all augmented assignment numeric methods
 
-    def __iadd__(self, other):
-        return _imethod(self, other, '__iadd__', operator.iadd)
-
-    def __isub__(self, other):
-        return _imethod(self, other, '__isub__', operator.isub)
-
-    def __imul__(self, other):
-        return _imethod(self, other, '__imul__', operator.imul)
+    __iadd__ = _make_imethod('__iadd__', operator.iadd)
+    __isub__ = _make_imethod('__isub__', operator.isub)
+    __imul__ = _make_imethod('__imul__', operator.imul)
 
     if sys.version_info[0:2] >= (3, 5):
-        def __imatmul__(self, other):
-            return _imethod(self, other, '__imatmul__', operator.imatmul)
+        __imatmul__ = _make_imethod('__imatmul__', operator.imatmul)
 
     if sys.version_info[0] == 2:
-        def __idiv__(self, other):
-            return _imethod(self, other, '__idiv__', operator.idiv)
-
-    def __itruediv__(self, other):
-        return _imethod(self, other, '__itruediv__', operator.itruediv)
-
-    def __ifloordiv__(self, other):
-        return _imethod(self, other, '__ifloordiv__', operator.ifloordiv)
+        __idiv__ = _make_imethod('__idiv__', operator.idiv)
 
-    def __imod__(self, other):
-        return _imethod(self, other, '__imod__', operator.imod)
+    __itruediv__ = _make_imethod('__itruediv__', operator.itruediv)
+    __ifloordiv__ = _make_imethod('__ifloordiv__', operator.ifloordiv)
+    __imod__ = _make_imethod('__imod__', operator.imod)
 
     def __ipow__(self, other, modulo=None):
         assert modulo is None
-        return _imethod(self, other, '__ipow__', operator.ipow)
-
-    def __ilshift__(self, other):
-        return _imethod(self, other, '__ilshift__', operator.ilshift)
-
-    def __irshift__(self, other):
-        return _imethod(self, other, '__irshift__', operator.irshift)
+        return _ipow(self, other)
 
-    def __iand__(self, other):
-        return _imethod(self, other, '__iand__', operator.iand)
-
-    def __ixor__(self, other):
-        return _imethod(self, other, '__ixor__', operator.ixor)
-
-    def __ior__(self, other):
-        return _imethod(self, other, '__ior__', operator.ior)
+    __ilshift__ = _make_imethod('__ilshift__', operator.ilshift)
+    __irshift__ = _make_imethod('__irshift__', operator.irshift)
+    __iand__ = _make_imethod('__iand__', operator.iand)
+    __ixor__ = _make_imethod('__ixor__', operator.ixor)
+    __ior__ = _make_imethod('__ior__', operator.ior)
 
     # all miscellaneous numeric methods
 
     def __neg__(self):
         proxiee = _get_proxiee(self)
-        _logger.debug("__neg__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__neg__ on proxiee (%r)", proxiee)
         return - proxiee
 
     def __pos__(self):
         proxiee = _get_proxiee(self)
-        _logger.debug("__pos__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__pos__ on proxiee (%r)", proxiee)
         return + proxiee
 
     def __abs__(self):
         proxiee = _get_proxiee(self)
-        _logger.debug("__abs__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__abs__ on proxiee (%r)", proxiee)
         return abs(proxiee)
 
     def __invert__(self):
         proxiee = _get_proxiee(self)
-        _logger.debug("__invert__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__invert__ on proxiee (%r)", proxiee)
         return ~ proxiee
 
     # Helpers for built-ins: complex(), int(), float() and round()
 
     def __complex__(self):
         proxiee = _get_proxiee(self)
-        _logger.debug("__complex__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__complex__ on proxiee (%r)", proxiee)
         return complex(proxiee)
 
     def __int__(self):
         proxiee = _get_proxiee(self)
-        _logger.debug("__int__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__int__ on proxiee (%r)", proxiee)
         return int(proxiee)
 
     if sys.version_info[0] == 2:
         def __long__(self):
             proxiee = _get_proxiee(self)
-            _logger.debug("__long__ on proxiee (%r)", proxiee)
+            if _DEBUG:
+                _logger.debug("__long__ on proxiee (%r)", proxiee)
             return long(proxiee)
 
     def __float__(self):
         proxiee = _get_proxiee(self)
-        _logger.debug("__float__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__float__ on proxiee (%r)", proxiee)
         return float(proxiee)
 
     if sys.version_info[0] == 3:
         def __round__(self, n):
             proxiee = _get_proxiee(self)
-            _logger.debug("__float__ on proxiee (%r)", proxiee)
+            if _DEBUG:
+                _logger.debug("__float__ on proxiee (%r)", proxiee)
             return round(proxiee, n)
 
     if sys.version_info[0] == 2:
         def __oct__(self):
             proxiee = _get_proxiee(self)
-            _logger.debug("__oct__ on proxiee (%r)", proxiee)
+            if _DEBUG:
+                _logger.debug("__oct__ on proxiee (%r)", proxiee)
             return oct(proxiee)
 
         def __hex__(self):
             proxiee = _get_proxiee(self)
-            _logger.debug("__hex__ on proxiee (%r)", proxiee)
+            if _DEBUG:
+                _logger.debug("__hex__ on proxiee (%r)", proxiee)
             return hex(proxiee)
 
     def __index__(self):
         proxiee = _get_proxiee(self)
-        _logger.debug("__index__ on proxiee (%r)", proxiee)
-        return operator.index(proxiee)
+        if _DEBUG:
+            _logger.debug("__index__ on proxiee (%r)", proxiee)
+        return _index(proxiee)
 
     if sys.version_info[0] == 2:
         def __coerce__(self, other):
             proxiee = _get_proxiee(self)
-            _logger.debug("__coerce__ on proxiee (%r)", proxiee)
+            if _DEBUG:
+                _logger.debug("__coerce__ on proxiee (%r)", proxiee)
             return coerce(proxiee, other)
 
     def __enter__(self):
         proxiee = _get_proxiee(self)
-        _logger.debug("__enter__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__enter__ on proxiee (%r)", proxiee)
         return proxiee.__enter__()
 
     def __exit__(self, exc_type, exc_value, traceback):
         proxiee = _get_proxiee(self)
-        _logger.debug("__exit__ on proxiee (%r)", proxiee)
+        if _DEBUG:
+            _logger.debug("__exit__ on proxiee (%r)", proxiee)
         return proxiee.__exit__(exc_type, exc_value, traceback)
 
 
+# The slot descriptor reads and writes the proxiee directly, without going
+# through either proxy_base.__getattribute__() (or __setattr__()) or the
+# generic implementations in object.
+_get_proxiee = proxy_base._original.__get__
+_set_proxiee = proxy_base._original.__set__
+_get_state = proxy_base._state.__get__
+_set_state = proxy_base._state.__set__
+
+
 class proxy_state(object):
 
     """
@@ -898,11 +1041,14 @@ class proxy_state(object):
     This class implements simple attribute-based access methods. It is normally
     instantiated internally for each proxy object. You don't want to fuss with
     it manually, instead just use :meth:`proxy.state()` function to access it.
+
+    The state object is a plain object, separate from the proxy, that may
+    hold any attributes.
     """
 
-    def __init__(self, proxy_obj):
-        proxy_dict = object.__getattribute__(proxy_obj, '__dict__')
-        object.__setattr__(self, '__dict__', proxy_dict)
+    # Only __dict__ is needed, there's no reason for state to be weakly
+    # referenced.
+    __slots__ = ('__dict__',)
 
     def __repr__(self):
         return "<{}.{} object at {:#x} with state {!r}>".format(
@@ -937,8 +1083,13 @@ class metaclass(object):
             # Patch-in __doc__ so that various help systems work better
             '__doc__': cls.__doc__,
         }
-        _logger.debug("metaclass(%s)(%s, name=%r)",
-                      self.mcls.__name__, cls.__name__, name)
+        if '__slots__' in cls.__dict__:
+            # The subclass must not bring back the instance dictionary that
+            # the decorated class opted out of.
+            ns['__slots__'] = ()
+        if _DEBUG:
+            _logger.debug("metaclass(%s)(%s, name=%r)",
+                          self.mcls.__name__, cls.__name__, name)
         return self.mcls(name, bases, ns)
 
 
@@ -1004,6 +1155,11 @@ class proxy(proxy_base):
         ['nyn zn xbgn', 'n xbg zn nyr']
     """
 
+    # NOTE: this class body is executed by type, not proxy_meta, so it has to
+    # ask for no instance dictionary explicitly. The subclass created by the
+    # metaclass decorator and all typed proxy classes follow suit.
+    __slots__ = ()
+
     # Registry of known typed_proxy_meta objects
     _m_registry = {}
 
@@ -1020,16 +1176,28 @@ class proxy(proxy_base):
             An instance of new subclass of ``proxy`` with injected meta-class
             proxy_meta[cls] where cls is the type of proxiee.
         """
-        _logger.debug(
-            "%s.__new__ with proxiee: %r (args: %r, kwargs %r)",
-            proxy_cls.__name__, proxiee, args, kwargs)
+        if _DEBUG:
+            _logger.debug(
+                "%s.__new__ with proxiee: %r (args: %r, kwargs %r)",
+                proxy_cls.__name__, proxiee, args, kwargs)
         proxiee_cls = type(proxiee)
-        typed_proxy_cls = proxy_cls[proxiee_cls]
+        if proxy_cls._proxiee_cls is proxiee_cls:
+            # This is the case for type(proxy_obj)(new_proxiee), as in the
+            # augmented assignment methods, when the type doesn't change.
+            typed_proxy_cls = proxy_cls
+        else:
+            # Typed proxy classes are created once and remembered in
+            # _c_registry of the untyped proxy class. Look there first and
+            # only fall back to proxy_meta.__getitem__() the first time a
+            # proxiee_cls is seen.
+            typed_proxy_cls = proxy_cls._untyped_base._c_registry.get(
+                proxiee_cls)
+            if typed_proxy_cls is None:
+                typed_proxy_cls = proxy_cls[proxiee_cls]
         proxy_obj = object.__new__(typed_proxy_cls)
-        state = proxy_state(proxy_obj)
         # _logger.debug("%s.__new__ inserted _original into instance",
         #               proxy_cls.__name__)
-        state._original = proxiee
+        _set_proxiee(proxy_obj, proxiee)
         # _logger.debug("%s.__new__ is about to return", proxy_cls.__name__)
         return proxy_obj
 
@@ -1040,8 +1208,9 @@ class proxy(proxy_base):
         :param proxiee:
             The object to proxy
         """
-        _logger.debug(
-            "%s.__init__ with proxiee: %r", type(proxy_obj).__name__, proxiee)
+        if _DEBUG:
+            _logger.debug("%s.__init__ with proxiee: %r",
+                          type(proxy_obj).__name__, proxiee)
 
     @staticmethod
     def direct(fn):
@@ -1067,7 +1236,8 @@ class proxy(proxy_base):
         documentation of the :mod:`padme` module.
         """
         fn.unproxied = True
-        _logger.debug("function %r marked as unproxied/direct", fn)
+        if _DEBUG:
+            _logger.debug("function %r marked as unproxied/direct", fn)
         return fn
 
     @staticmethod
@@ -1105,8 +1275,7 @@ class proxy(proxy_base):
             >>> l
             [42]
         """
-        state = proxy_state(proxy_obj)
-        return state._original
+        return _get_proxiee(proxy_obj)
 
     @staticmethod
     def state(proxy_obj):
@@ -1117,7 +1286,9 @@ class proxy(proxy_base):
         stateful proxy objects. This allows you to put state on objects that
         cannot otherwise hold it (typically built-in classes or classes using
         ``__slots__``) and to keep the state invisible to the original object
-        so that it cannot interfere with any future APIs.
+        so that it cannot interfere with any future APIs. The state object is
+        created on first use, which is thread-safe: all threads get the same
+        one.
 
         To use it, just call it on any proxy object and use the return value as
         a normal object you can get/set attributes on. For example:
@@ -1137,7 +1308,20 @@ class proxy(proxy_base):
             >>> proxy.state(life).foo
             True
         """
-        return proxy_state(proxy_obj)
+        try:
+            return _get_state(proxy_obj)
+        except AttributeError:
+            pass
+        # Most proxies never use state so it is only created on demand. The
+        # lock makes sure that concurrent first calls all get the same state
+        # object, the check is repeated as another thread may have won.
+        with _state_lock:
+            try:
+                return _get_state(proxy_obj)
+            except AttributeError:
+                state = proxy_state()
+                _set_state(proxy_obj, state)
+                return state
 
 
 # 1.0 backwards-compatibility aliases
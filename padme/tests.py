@@ -28,12 +28,18 @@ from __future__ import print_function, absolute_import, unicode_literals
 import doctest
 import operator
 import sys
+import threading
 
 from padme import _logger
 from padme import proxy
 from padme import unproxied
 
-if sys.version_info[0:2] >= (3, 4):
+_PY2 = sys.version_info[0] == 2
+_PY3 = sys.version_info[0] == 3
+_PY34 = sys.version_info[0:2] >= (3, 4)
+_PY35 = sys.version_info[0:2] >= (3, 5)
+
+if _PY34:
     import unittest
     from unittest import mock
 else:
@@ -41,60 +47,297 @@ else:
     import mock
 
 
-# https://code.google.com/p/mock/issues/detail?id=247
-# or http://bugs.python.org/issue23569
-if sys.version_info[0] == 3 and '__div__' in mock._all_magics:
-    mock._magics.remove('__div__')
-    mock._magics.remove('__rdiv__')
-    mock._magics.remove('__idiv__')
-    mock._all_magics.remove('__div__')
-    mock._all_magics.remove('__rdiv__')
-    mock._all_magics.remove('__idiv__')
-if sys.version_info[0] == 3 and '__truediv__' not in mock._all_magics:
-    mock._magics.add('__truediv__')
-    mock._magics.add('__rtruediv__')
-    mock._magics.add('__itruediv__')
-    mock._all_magics.add('__truediv__')
-    mock._all_magics.add('__rtruediv__')
-    mock._all_magics.add('__itruediv__')
-
-# http://bugs.python.org/issue23568
-if '__rdivmod__' not in mock._magics:
-    mock._magics.add('__rdivmod__')
-    mock._all_magics.add('__rdivmod__')
-
-# http://bugs.python.org/issue23581
-if 'matmul' not in mock.numerics:
-    mock._magics.add('__matmul__')
-    mock._magics.add('__rmatmul__')
-    mock._magics.add('__imatmul__')
-    mock._all_magics.add('__matmul__')
-    mock._all_magics.add('__rmatmul__')
-    mock._all_magics.add('__imatmul__')
-
-
 # XXX: Set to True for revelation
 reality_is_broken = False
 
+_proxy_cache = {}
+
+
+def cached_proxy(value):
+    """
+    Get a shared proxy of an immutable value.
+
+    Proxies are cached by type and value, as 2, 2.0 and True compare equal.
+    Only use this for values that a test never mutates or checks for
+    identity, for everything else just call :class:`proxy`.
+    """
+    key = (type(value), value)
+    try:
+        return _proxy_cache[key]
+    except KeyError:
+        return _proxy_cache.setdefault(key, proxy(value))
+
+
+# (dunder, operator) pairs for test_binary_operators(). Python 2 division and
+# matrix multiplication are version-specific and are tested separately.
+_BINARY_OPERATORS = (
+    ('__add__', operator.add),
+    ('__sub__', operator.sub),
+    ('__mul__', operator.mul),
+    ('__truediv__', operator.truediv),
+    ('__floordiv__', operator.floordiv),
+    ('__mod__', operator.mod),
+    ('__divmod__', divmod),
+    ('__pow__', operator.pow),
+    ('__pow__', pow),
+    ('__lshift__', operator.lshift),
+    ('__rshift__', operator.rshift),
+    ('__and__', operator.and_),
+    ('__xor__', operator.xor),
+    ('__or__', operator.or_),
+)
+
+# The same for test_reflected_operators().
+_REFLECTED_OPERATORS = tuple(
+    ('__r' + dunder[2:], op) for dunder, op in _BINARY_OPERATORS)
+
+# (operator, a, b, result) where op(a, b) == result, checked with a proxy of
+# either operand.
+_BINARY_OPERATOR_RESULTS = (
+    (operator.add, 4.5, 2, 6.5),
+    (operator.add, 5, 2, 7),
+    (operator.add, "foo", "bar", "foobar"),
+    (operator.sub, 4.5, 2, 2.5),
+    (operator.sub, 5, 2, 3),
+    (operator.mul, 4.5, 2, 9.0),
+    (operator.mul, 5, 2, 10),
+    (operator.mul, "foo", 2, "foofoo"),
+    (operator.truediv, 4.5, 2, 2.25),
+    (operator.truediv, 5, 2, 2.5),
+    (operator.floordiv, 4.5, 2, 2),
+    (operator.floordiv, 5, 2, 2),
+    (operator.mod, 4.5, 2, 0.5),
+    (operator.mod, 5, 2, 1),
+    (divmod, 4.5, 2, (2, 0.5)),
+    (divmod, 5, 2, (2, 1)),
+    (pow, 2, 3, 8),
+    (operator.lshift, 1, 3, 8),
+    (operator.rshift, 8, 3, 1),
+    (operator.and_, 7, 4, 4),
+    (operator.xor, 1, 1, 0),
+    (operator.xor, 1, 0, 1),
+    (operator.xor, 0, 0, 0),
+    (operator.xor, 0, 1, 1),
+    (operator.or_, 1, 2, 3),
+)
+
+# (operator, a, b) where op(a, b) raises TypeError.
+_BINARY_OPERATOR_TYPE_ERRORS = (
+    (operator.add, "foo", 2),
+    (operator.add, 2, "foo"),
+    (operator.sub, "foo", 2),
+)
+
+
+# (operator, value, other, result) where op(value, other) == result for an
+# immutable value, checked with a proxy of the value. Python 2 division is
+# tested separately.
+_INPLACE_OPERATOR_RESULTS = (
+    (operator.iadd, 2, 2, 4),
+    (operator.iadd, "hello", " world", "hello world"),
+    (operator.isub, 4, 3, 1),
+    (operator.imul, 4, 2, 8),
+    (operator.itruediv, 7, 2, 3.5),
+    (operator.ifloordiv, 7, 2, 3),
+    (operator.imod, 7, 2, 1),
+    (operator.ipow, 7, 2, 49),
+    (operator.ilshift, 1, 10, 1024),
+    (operator.irshift, 1024, 10, 1),
+    (operator.iand, 7, 4, 4),
+    (operator.ixor, 7, 5, 2),
+    (operator.ior, 7, 8, 15),
+)
+
+
+# Names of all the special methods known to padme, for test_hasattr_parity().
+_SPECIAL_METHODS = tuple(str('''
+    __del__
+    __repr__
+    __str__
+    __bytes__
+    __format__
+    __lt__
+    __le__
+    __eq__
+    __ne__
+    __gt__
+    __ge__
+    __cmp__
+    __hash__
+    __bool__
+    __nonzero__
+    __unicode__
+    __getattr__
+    __getattribute__
+    __setattr__
+    __delattr__
+    __dir__
+    __get__
+    __set__
+    __delete__
+    __call__
+    __len__
+    __length_hint__
+    __getitem__
+    __setitem__
+    __delitem__
+    __iter__
+    __reversed__
+    __contains__
+    __add__
+    __sub__
+    __mul__
+    __floordiv__
+    __mod__
+    __divmod__
+    __pow__
+    __lshift__
+    __rshift__
+    __and__
+    __xor__
+    __or__
+    __div__
+    __truediv__
+    __radd__
+    __rsub__
+    __rmul__
+    __rdiv__
+    __rtruediv__
+    __rfloordiv__
+    __rmod__
+    __rdivmod__
+    __rpow__
+    __rlshift__
+    __rrshift__
+    __rand__
+    __rxor__
+    __ror__
+    __iadd__
+    __isub__
+    __imul__
+    __idiv__
+    __itruediv__
+    __ifloordiv__
+    __imod__
+    __ipow__
+    __ilshift__
+    __irshift__
+    __iand__
+    __ixor__
+    __ior__
+    __neg__
+    __pos__
+    __abs__
+    __invert__
+    __complex__
+    __int__
+    __long__
+    __float__
+    __oct__
+    __hex__
+    __index__
+    __coerce__
+    __enter__
+    __exit__
+''').split())
+
+
+class _caching_doctest_finder(doctest.DocTestFinder):
+
+    """
+    Doctest finder that looks at the docstrings of each object only once.
+
+    Test suites cannot be reused, as they drop their tests as they run them,
+    but the :class:`doctest.DocTest` objects they wrap can. Each
+    :class:`doctest.DocTestCase` restores the globals of its test when done.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(_caching_doctest_finder, self).__init__(*args, **kwargs)
+        self._found = {}
+
+    def find(self, obj, *args, **kwargs):
+        try:
+            found = self._found[obj]
+        except KeyError:
+            found = self._found.setdefault(obj, super(
+                _caching_doctest_finder, self).find(obj, *args, **kwargs))
+        # NOTE: DocTestSuite() sorts the list it gets in place
+        return list(found)
+
+
+_doctest_finder = _caching_doctest_finder()
+
 
 def load_tests(loader, tests, ignore):
     """ Load doctests for padme (part of unittest test discovery protocol). """
+    if sys.flags.optimize >= 2:
+        # Docstrings are stripped with -OO so there is nothing to look for.
+        return tests
     import padme
-    tests.addTests(
-        doctest.DocTestSuite(padme, optionflags=doctest.REPORT_NDIFF))
+    tests.addTests(doctest.DocTestSuite(
+        padme, optionflags=doctest.REPORT_NDIFF, test_finder=_doctest_finder))
     return tests
 
 
+def _patch_mock_magics():
+    """
+    Teach mock about the magic methods it gets wrong on some Pythons.
+
+    This is called from :func:`setUpModule()` rather than at import time so
+    that just importing this module has no side effects. The mock module is
+    marked once patched so that calling it again, even after this module is
+    reloaded, does nothing.
+    """
+    if getattr(mock, '_padme_patched', False):
+        return
+    # https://code.google.com/p/mock/issues/detail?id=247
+    # or http://bugs.python.org/issue23569
+    if _PY3 and '__div__' in mock._all_magics:
+        mock._magics.remove('__div__')
+        mock._magics.remove('__rdiv__')
+        mock._magics.remove('__idiv__')
+        mock._all_magics.remove('__div__')
+        mock._all_magics.remove('__rdiv__')
+        mock._all_magics.remove('__idiv__')
+    if _PY3 and '__truediv__' not in mock._all_magics:
+        mock._magics.add('__truediv__')
+        mock._magics.add('__rtruediv__')
+        mock._magics.add('__itruediv__')
+        mock._all_magics.add('__truediv__')
+        mock._all_magics.add('__rtruediv__')
+        mock._all_magics.add('__itruediv__')
+
+    # http://bugs.python.org/issue23568
+    if '__rdivmod__' not in mock._magics:
+        mock._magics.add('__rdivmod__')
+        mock._all_magics.add('__rdivmod__')
+
+    # http://bugs.python.org/issue23581
+    if 'matmul' not in mock.numerics:
+        mock._magics.add('__matmul__')
+        mock._magics.add('__rmatmul__')
+        mock._magics.add('__imatmul__')
+        mock._all_magics.add('__matmul__')
+        mock._all_magics.add('__rmatmul__')
+        mock._all_magics.add('__imatmul__')
+
+    mock._padme_patched = True
+
+
 def setUpModule():
     """ Module-level setup function (part of unittest protocol). """
+    _patch_mock_magics()
     if reality_is_broken:
         import logging
+        import padme
         logging.basicConfig(level=logging.DEBUG)
+        padme._DEBUG = True
 
 
-class proxy_as_function(unittest.TestCase):
+class padme_test_case(unittest.TestCase):
 
-    """ Tests for uses of proxy() as factory for proxy objects.  """
+    """ Base class for all padme tests, logs each test in debugging mode. """
 
     def setUp(self):
         """ Per-test-case setup function. """
@@ -102,27 +345,66 @@ class proxy_as_function(unittest.TestCase):
             print()
             _logger.debug("STARTING")
             _logger.debug("[%s]", self._testMethodName)
-        self.obj = mock.MagicMock(name='obj')
-        self.proxy = proxy(self.obj)
 
     def tearDown(self):
         """ Per-test-case teardown function. """
         if reality_is_broken:
             _logger.debug("DONE")
 
+
+class proxy_test_case(padme_test_case):
+
+    """ Base class for tests of proxy objects created with proxy(). """
+
+    # NOTE: MagicMock is expensive to create and many tests bring their own
+    # proxiee so both fixtures below are only created on first use.
+
+    @property
+    def obj(self):
+        """ The proxiee, a fresh MagicMock unless assigned to. """
+        try:
+            return self._obj
+        except AttributeError:
+            self._obj = mock.MagicMock(name='obj')
+            return self._obj
+
+    @obj.setter
+    def obj(self, value):
+        self._obj = value
+
+    @property
+    def proxy(self):
+        """ The proxy around :attr:`obj`, unless assigned to. """
+        try:
+            return self._proxy
+        except AttributeError:
+            self._proxy = proxy(self.obj)
+            return self._proxy
+
+    @proxy.setter
+    def proxy(self, value):
+        self._proxy = value
+
+
+class proxy_as_function(proxy_test_case):
+
+    """ Tests for uses of proxy() as factory for proxy objects.  """
+
     # NOTE: order of test methods matches implementation
 
     def test_repr(self):
         """ Verify that repr/__repr__ is redirected to the proxiee. """
-        self.assertEqual(repr(self.proxy), repr(self.obj))
-        self.assertEqual(self.proxy.__repr__(), repr(self.obj))
+        expected = repr(self.obj)
+        self.assertEqual(repr(self.proxy), expected)
+        self.assertEqual(self.proxy.__repr__(), expected)
 
     def test_str(self):
         """ Verify that str/__str__ is redirected to the proxiee. """
-        self.assertEqual(str(self.proxy), str(self.obj))
-        self.assertEqual(self.proxy.__str__(), str(self.obj))
+        expected = str(self.obj)
+        self.assertEqual(str(self.proxy), expected)
+        self.assertEqual(self.proxy.__str__(), expected)
 
-    @unittest.skipUnless(sys.version_info[0] == 3, "requires python 3")
+    @unittest.skipUnless(_PY3, "requires python 3")
     def test_bytes(self):
         """ Verify that bytes/__bytes__ is redirected to the proxiee. """
         # NOTE: bytes() is unlike str() or repr() in that it is not a function
@@ -134,97 +416,42 @@ class proxy_as_function(unittest.TestCase):
                 return b'good'
         self.obj = C()
         self.proxy = proxy(self.obj)
-        self.assertEqual(bytes(self.proxy), bytes(self.obj))
-        self.assertEqual(self.proxy.__bytes__(), bytes(self.obj))
+        expected = bytes(self.obj)
+        self.assertEqual(bytes(self.proxy), expected)
+        self.assertEqual(self.proxy.__bytes__(), expected)
 
     def test_format(self):
         """ Verify that format/__format__ is redirected to the proxiee. """
-        self.assertEqual(format(self.proxy), format(self.obj))
-        self.assertEqual(self.proxy.__format__(""), format(self.obj))
-
-    def test_lt(self):
-        """ Verify that < /__lt__ is redirected to the proxiee. """
-        # NOTE: MagicMock is not ordered so let's just use an integer
-        self.obj = 0
-        self.proxy = proxy(self.obj)
-        self.assertLess(self.proxy, 1)
-        self.assertLess(self.obj, 1)
-
-    def test_le(self):
-        """ Verify that <=/ __le__ is redirected to the proxiee. """
-        # NOTE: MagicMock is not ordered so let's just use an integer
-        self.obj = 0
-        self.proxy = proxy(self.obj)
-        self.assertLessEqual(self.proxy, 0)
-        self.assertLessEqual(self.proxy, 1)
-        self.assertLessEqual(self.obj, 0)
-        self.assertLessEqual(self.obj, 1)
-
-    def test_eq(self):
-        """ Verify that == /__eq__ is redirected to the proxiee. """
-        self.assertEqual(self.proxy, self.obj)
-        self.obj.__eq__.assert_called_once_with(self.obj)
-        self.assertEqual(self.obj, self.obj)
-
-    def test_ne(self):
-        """ Verify that != /__ne__ is redirected to the proxiee. """
-        other = object()
-        self.assertNotEqual(self.proxy, other)
-        self.obj.__ne__.assert_called_once_with(other)
-        self.assertNotEqual(self.obj, object())
-
-    def test_gt(self):
-        """ Verify that > /__gt__ is redirected to the proxiee. """
-        # NOTE: MagicMock is not ordered so let's just use an integer
-        self.obj = 0
-        self.proxy = proxy(self.obj)
-        self.assertGreater(self.proxy, -1)
-        self.assertGreater(self.obj, -1)
-
-    def test_ge(self):
-        """ Verify that >= /__ge__ is redirected to the proxiee. """
-        # NOTE: MagicMock is not ordered so let's just use an integer
-        self.obj = 0
-        self.proxy = proxy(self.obj)
-        self.assertGreaterEqual(self.proxy, 0)
-        self.assertGreaterEqual(self.proxy, -1)
-        self.assertGreaterEqual(self.obj, 0)
-        self.assertGreaterEqual(self.obj, -1)
-
-    @unittest.skipUnless(sys.version_info[0] == 2, "requires python 2")
-    def test_cmp(self):
-        """ Verify that cmp /__cmp__ is redirected to the proxiee. """
-        class C(object):
-            def __cmp__(self, other):
-                return -1
-        self.obj = C()
-        self.proxy = proxy(self.obj)
-        other = object()
-        self.assertEqual(cmp(self.proxy, other), cmp(self.obj, other))
-        self.assertEqual(self.proxy.__cmp__(other), cmp(self.obj, other))
+        expected = format(self.obj)
+        self.assertEqual(format(self.proxy), expected)
+        self.assertEqual(self.proxy.__format__(""), expected)
 
     def test_hash(self):
         """ Verify that hash /__hash__ is redirected to the proxiee. """
-        self.assertEqual(hash(self.proxy), hash(self.obj))
-        self.assertEqual(self.proxy.__hash__(), hash(self.obj))
+        expected = hash(self.obj)
+        self.assertEqual(hash(self.proxy), expected)
+        self.assertEqual(self.proxy.__hash__(), expected)
 
-    @unittest.skipUnless(sys.version_info[0] == 3, "requires python 3")
+    @unittest.skipUnless(_PY3, "requires python 3")
     def test_bool(self):
         """ Verify that bool /__bool__ is redirected to the proxiee. """
-        self.assertEqual(bool(self.proxy), bool(self.obj))
-        self.assertEqual(self.proxy.__bool__(), bool(self.obj))
+        expected = bool(self.obj)
+        self.assertEqual(bool(self.proxy), expected)
+        self.assertEqual(self.proxy.__bool__(), expected)
 
-    @unittest.skipUnless(sys.version_info[0] == 2, "requires python 2")
+    @unittest.skipUnless(_PY2, "requires python 2")
     def test_nonzero(self):
         """ Verify that bool /__nonzero__ is redirected to the proxiee. """
-        self.assertEqual(bool(self.proxy), bool(self.obj))
-        self.assertEqual(self.proxy.__nonzero__(), bool(self.obj))
+        expected = bool(self.obj)
+        self.assertEqual(bool(self.proxy), expected)
+        self.assertEqual(self.proxy.__nonzero__(), expected)
 
-    @unittest.skipUnless(sys.version_info[0] == 2, "requires python 2")
+    @unittest.skipUnless(_PY2, "requires python 2")
     def test_unicode(self):
         """ Verify that unicode /__unicode__ is redirected to the proxiee. """
-        self.assertEqual(unicode(self.proxy), unicode(self.obj))
-        self.assertEqual(self.proxy.__unicode__(), unicode(self.obj))
+        expected = unicode(self.obj)
+        self.assertEqual(unicode(self.proxy), expected)
+        self.assertEqual(self.proxy.__unicode__(), expected)
 
     def test_attr_get(self):
         """ Verify that attribute reads are redirected to the proxiee. """
@@ -244,8 +471,9 @@ class proxy_as_function(unittest.TestCase):
 
     def test_dir(self):
         """ Verify that dir / __dir__ is redirected to the proxiee. """
-        self.assertEqual(dir(self.proxy), dir(self.obj))
-        self.assertEqual(self.proxy.__dir__(), dir(self.obj))
+        expected = dir(self.obj)
+        self.assertEqual(dir(self.proxy), expected)
+        self.assertEqual(self.proxy.__dir__(), expected)
 
     def test_descriptor_methods(self):
         """ Verify that __{get,set,delete}__ are redirected to the proxiee. """
@@ -278,16 +506,195 @@ class proxy_as_function(unittest.TestCase):
 
     def test_call(self):
         """ Verify that __call__ is redirected to the proxiee. """
-        self.assertEqual(self.proxy(), self.obj())
-        self.assertEqual(self.proxy.__call__(), self.obj())
+        expected = self.obj()
+        self.assertEqual(self.proxy(), expected)
+        self.assertEqual(self.proxy.__call__(), expected)
+
+    def test_context_manager_methods_v1(self):
+        """ Verify that __enter__ and __exit__ are redirected. """
+        with self.proxy:
+            pass
+        self.obj.__enter__.assert_called_once_with()
+        self.obj.__exit__.assert_called_once_with(None, None, None)
+
+    def test_context_manager_methods_v2(self):
+        """ Verify that redirecting __exit__ passes right arguments. """
+        exc = Exception("boom")
+        with self.assertRaises(Exception) as cm:
+            with self.proxy:
+                raise exc
+        self.assertIs(cm.exception, exc)
+        self.obj.__enter__.assert_called_once_with()
+        self.obj.__exit__.assert_called_once_with(Exception, exc, mock.ANY)
+        # NOTE: the traceback is that of the raise statement above, the only
+        # portable way to check it is to look at the frame it points to.
+        traceback = self.obj.__exit__.call_args[0][2]
+        self.assertIs(traceback.tb_frame, sys._getframe())
+
+    def test_hasattr_parity(self):
+        """ verify that hasattr() behaves the same for original and proxy. """
+        class C(object):
+            pass
+        for obj in [C(), 42, property(lambda x: x), int, None]:
+            proxy_obj = proxy(obj)
+            # NOTE: on failure assertEqual() lists the attributes that are
+            # present on only one of the two objects.
+            self.assertEqual(
+                set(attr for attr in _SPECIAL_METHODS if hasattr(obj, attr)),
+                set(attr for attr in _SPECIAL_METHODS
+                    if hasattr(proxy_obj, attr)),
+                "attribute presence mismatch on object %r" % (obj,))
+
+    def test_isinstance(self):
+        """ Verify that isinstance() checks work. """
+        # NOTE: this method tests the metaclass
+        self.assertIsInstance(self.obj, type(self.obj))
+        self.assertIsInstance(self.proxy, type(self.obj))
+
+    def test_issubclass(self):
+        """ Verify that issubclass() checks work. """
+        # NOTE: this method tests the metaclass
+        # NOTE: mock doesn't support subclasscheck
+        # NOTE: str ... below is just for python 2.7
+        # (__future__.unicode_literals is in effect)
+        obj = str("something other than mock")
+        self.assertTrue(issubclass(str, type(obj)))
+        self.assertTrue(issubclass(str, type(proxy(obj))))
+
+    def test_class(self):
+        """ Verify that proxy_obj.__class__ is redirected to the proxiee. """
+        self.assertEqual(self.proxy.__class__, self.obj.__class__)
+        # NOTE: The proxy cannot hide the fact, that it is a proxy
+        self.assertNotEqual(type(self.proxy), type(self.obj))
+
+    def test_state(self):
+        """ Verify that proxy.state() returns the same state object. """
+        state = proxy.state(self.proxy)
+        state.foo = 42
+        self.assertIs(proxy.state(self.proxy), state)
+        self.assertEqual(proxy.state(self.proxy).foo, 42)
+        # NOTE: a fresh proxy of the same object has its own state
+        self.assertIsNot(proxy.state(proxy(self.obj)), state)
+
+    def test_state__concurrent_first_use(self):
+        """ Verify that concurrent first calls to proxy.state() agree. """
+        import padme
+        proxy_obj = proxy(object())
+        real_proxy_state = padme.proxy_state
+        found = {}
+        threads = []
+
+        def other_thread():
+            found['state'] = proxy.state(proxy_obj)
+            found['state'].other = True
+
+        def racing_proxy_state():
+            # Ask for the state from another thread while this one is busy
+            # creating it. Without any locking the other thread has plenty
+            # of time to create and store its own state object.
+            if not threads:
+                threads.append(threading.Thread(target=other_thread))
+                threads[0].start()
+                threads[0].join(0.1)
+            return real_proxy_state()
+        with mock.patch('padme.proxy_state', racing_proxy_state):
+            state = proxy.state(proxy_obj)
+            state.mine = True
+            threads[0].join()
+        self.assertIs(found['state'], state)
+        self.assertIs(proxy.state(proxy_obj), state)
+        self.assertTrue(state.mine)
+        self.assertTrue(state.other)
+
+    def test_no_instance_dict(self):
+        """ Verify that proxy objects don't have an instance dictionary. """
+        # NOTE: setattr() would be redirected to the proxiee
+        with self.assertRaises(AttributeError):
+            object.__setattr__(self.proxy, 'foo', 42)
+
+
+class proxy_as_function_comparisons(proxy_test_case):
+
+    """ Tests for comparison methods of proxy objects. """
+
+    # NOTE: order of test methods matches implementation
+
+    def test_lt(self):
+        """ Verify that < /__lt__ is redirected to the proxiee. """
+        # NOTE: MagicMock is not ordered so let's just use an integer
+        self.obj = 0
+        self.proxy = cached_proxy(self.obj)
+        self.assertLess(self.proxy, 1)
+        self.assertLess(self.obj, 1)
+
+    def test_le(self):
+        """ Verify that <=/ __le__ is redirected to the proxiee. """
+        # NOTE: MagicMock is not ordered so let's just use an integer
+        self.obj = 0
+        self.proxy = cached_proxy(self.obj)
+        self.assertLessEqual(self.proxy, 0)
+        self.assertLessEqual(self.proxy, 1)
+        self.assertLessEqual(self.obj, 0)
+        self.assertLessEqual(self.obj, 1)
+
+    def test_eq(self):
+        """ Verify that == /__eq__ is redirected to the proxiee. """
+        self.assertEqual(self.proxy, self.obj)
+        self.obj.__eq__.assert_called_once_with(self.obj)
+        self.assertEqual(self.obj, self.obj)
+
+    def test_ne(self):
+        """ Verify that != /__ne__ is redirected to the proxiee. """
+        other = object()
+        self.assertNotEqual(self.proxy, other)
+        self.obj.__ne__.assert_called_once_with(other)
+        self.assertNotEqual(self.obj, object())
+
+    def test_gt(self):
+        """ Verify that > /__gt__ is redirected to the proxiee. """
+        # NOTE: MagicMock is not ordered so let's just use an integer
+        self.obj = 0
+        self.proxy = cached_proxy(self.obj)
+        self.assertGreater(self.proxy, -1)
+        self.assertGreater(self.obj, -1)
+
+    def test_ge(self):
+        """ Verify that >= /__ge__ is redirected to the proxiee. """
+        # NOTE: MagicMock is not ordered so let's just use an integer
+        self.obj = 0
+        self.proxy = cached_proxy(self.obj)
+        self.assertGreaterEqual(self.proxy, 0)
+        self.assertGreaterEqual(self.proxy, -1)
+        self.assertGreaterEqual(self.obj, 0)
+        self.assertGreaterEqual(self.obj, -1)
+
+    @unittest.skipUnless(_PY2, "requires python 2")
+    def test_cmp(self):
+        """ Verify that cmp /__cmp__ is redirected to the proxiee. """
+        class C(object):
+            def __cmp__(self, other):
+                return -1
+        self.obj = C()
+        self.proxy = proxy(self.obj)
+        other = object()
+        expected = cmp(self.obj, other)
+        self.assertEqual(cmp(self.proxy, other), expected)
+        self.assertEqual(self.proxy.__cmp__(other), expected)
+
+
+class proxy_as_function_containers(proxy_test_case):
+
+    """ Tests for container methods of proxy objects. """
+
+    # NOTE: order of test methods matches implementation
 
     def test_len(self):
         """ Verify that len / __len__ is redirected to the proxiee. """
-        self.assertEqual(len(self.proxy), len(self.obj))
-        self.assertEqual(self.proxy.__len__(), len(self.obj))
+        expected = len(self.obj)
+        self.assertEqual(len(self.proxy), expected)
+        self.assertEqual(self.proxy.__len__(), expected)
 
-    @unittest.skipUnless(sys.version_info[0:2] >= (3, 4),
-                         "requires python 3.4")
+    @unittest.skipUnless(_PY34, "requires python 3.4")
     def test_length_hint(self):
         """ Verify that __length_hint__ is redirected to the proxiee. """
         # NOTE: apparently MagicMock doesn't support this method
@@ -296,15 +703,15 @@ class proxy_as_function(unittest.TestCase):
                 return 42
         self.obj = C()
         self.proxy = proxy(self.obj)
-        self.assertEqual(
-            operator.length_hint(self.proxy), operator.length_hint(self.obj))
-        self.assertEqual(
-            self.proxy.__length_hint__(), operator.length_hint(self.obj))
+        expected = operator.length_hint(self.obj)
+        self.assertEqual(operator.length_hint(self.proxy), expected)
+        self.assertEqual(self.proxy.__length_hint__(), expected)
 
     def test_getitem(self):
         """ Verify that [] / __getitem__ is redirected to the proxiee. """
-        self.assertEqual(self.proxy['item'], self.obj['item'])
-        self.assertEqual(self.proxy.__getitem__('item'), self.obj['item'])
+        expected = self.obj['item']
+        self.assertEqual(self.proxy['item'], expected)
+        self.assertEqual(self.proxy.__getitem__('item'), expected)
 
     def test_setitem_v1(self):
         """ Verify that []= is redirected to the proxiee. """
@@ -336,8 +743,9 @@ class proxy_as_function(unittest.TestCase):
         # NOTE: MagicMock.__iter__ needs to return a deterministic iterator as
         # by default a new iterator is returned each time.
         self.obj.__iter__.return_value = iter([])
-        self.assertEqual(iter(self.proxy), iter(self.obj))
-        self.assertEqual(self.proxy.__iter__(), iter(self.obj))
+        expected = iter(self.obj)
+        self.assertEqual(iter(self.proxy), expected)
+        self.assertEqual(self.proxy.__iter__(), expected)
 
     def test_reversed(self):
         """ Verify that __reversed__ is redirected to the proxiee. """
@@ -345,7 +753,7 @@ class proxy_as_function(unittest.TestCase):
         # back to the approach with a custom class. The same comment, as above,
         # for __iter__() applies though.
         with self.assertRaises(AttributeError):
-            self.obj.__reversed__.return_value = reversed([])
+            self.obj.__reversed__
 
         class C(object):
             reversed_retval = iter([])
@@ -354,281 +762,122 @@ class proxy_as_function(unittest.TestCase):
                 return self.reversed_retval
         self.obj = C()
         self.proxy = proxy(self.obj)
-        self.assertEqual(reversed(self.proxy), reversed(self.obj))
-        self.assertEqual(self.proxy.__reversed__(), reversed(self.obj))
+        expected = reversed(self.obj)
+        self.assertEqual(reversed(self.proxy), expected)
+        self.assertEqual(self.proxy.__reversed__(), expected)
 
     def test_contains(self):
         """ Verify that __contains__ is redirected to the proxiee. """
         item = object()
-        self.assertEqual(item in self.proxy, item in self.obj)
-        self.assertEqual(self.proxy.__contains__(item), item in self.obj)
+        expected = item in self.obj
+        self.assertEqual(item in self.proxy, expected)
+        self.assertEqual(self.proxy.__contains__(item), expected)
         self.assertEqual(self.proxy.__contains__(item), False)
         self.obj.__contains__.return_value = True
-        self.assertEqual(item in self.proxy, item in self.obj)
-        self.assertEqual(self.proxy.__contains__(item), item in self.obj)
+        expected = item in self.obj
+        self.assertEqual(item in self.proxy, expected)
+        self.assertEqual(self.proxy.__contains__(item), expected)
         self.assertEqual(self.proxy.__contains__(item), True)
 
-    def test_add(self):
-        other = mock.MagicMock()
-        self.assertEqual(self.proxy + other, self.obj + other)
-        self.assertEqual(self.proxy.__add__(other), self.obj + other)
-        self.assertEqual(proxy(4.5) + 2, 6.5)
-        self.assertEqual(proxy(5) + 2, 7)
-        with self.assertRaises(TypeError):
-            proxy("foo") + 2
-        self.assertEqual(proxy("foo") + "bar", "foobar")
-
-    def test_sub(self):
-        other = mock.MagicMock()
-        self.assertEqual(self.proxy - other, self.obj - other)
-        self.assertEqual(self.proxy.__sub__(other), self.obj - other)
-        self.assertEqual(proxy(4.5) - 2, 2.5)
-        self.assertEqual(proxy(5) - 2, 3)
-        with self.assertRaises(TypeError):
-            proxy("foo") - 2
-
-    def test_mul(self):
-        other = mock.MagicMock()
-        self.assertEqual(self.proxy * other, self.obj * other)
-        self.assertEqual(self.proxy.__mul__(other), self.obj * other)
-        self.assertEqual(proxy(4.5) * 2, 9.0)
-        self.assertEqual(proxy(5) * 2, 10)
-        self.assertEqual(proxy("foo") * 2, "foofoo")
-
-    @unittest.skipUnless(
-        sys.version_info[0:2] >= (3, 5), "requires python 3.5")
+
+class proxy_as_function_operators(proxy_test_case):
+
+    """ Tests for binary and reflected operators of proxies. """
+
+    # NOTE: order of test methods matches implementation
+
+    def test_binary_operators(self):
+        """ Verify that binary operators are redirected to the proxiee. """
+        # NOTE: ``other`` is only passed around so it can be a plain object,
+        # it doesn't have to be a (much more expensive) mock.
+        other = object()
+        for dunder, op in _BINARY_OPERATORS:
+            with self.subTest(op=op, dunder=dunder):
+                expected = op(self.obj, other)
+                self.assertEqual(op(self.proxy, other), expected)
+                self.assertEqual(getattr(self.proxy, dunder)(other), expected)
+
+    @unittest.skipUnless(_PY35, "requires python 3.5")
     def test_matmul(self):
-        other = mock.MagicMock()
-        self.assertEqual(operator.matmul(self.proxy, other),
-                         operator.matmul(self.obj, other))
-        self.assertEqual(self.proxy.__matmul__(other),
-                         operator.matmul(self.obj, other))
+        other = object()
+        expected = operator.matmul(self.obj, other)
+        self.assertEqual(operator.matmul(self.proxy, other), expected)
+        self.assertEqual(self.proxy.__matmul__(other), expected)
 
-    @unittest.skipUnless(sys.version_info[0] == 2, "requires python 2")
+    @unittest.skipUnless(_PY2, "requires python 2")
     def test_div(self):
-        other = mock.MagicMock()
-        self.assertEqual(operator.div(self.proxy, other),
-                         operator.div(self.obj, other))
-        self.assertEqual(self.proxy.__div__(other),
-                         operator.div(self.obj, other))
-        self.assertEqual(operator.div(proxy(4.5), 2), 2.25)
-        self.assertEqual(operator.div(proxy(5), 2), 2)
-
-    def test_truediv(self):
-        other = mock.MagicMock()
-        self.assertEqual(operator.truediv(self.proxy, other),
-                         operator.truediv(self.obj, other))
-        self.assertEqual(self.proxy.__truediv__(other),
-                         operator.truediv(self.obj, other))
-        self.assertEqual(operator.truediv(proxy(4.5), 2), 2.25)
-        self.assertEqual(operator.truediv(proxy(5), 2), 2.5)
-
-    def test_floordiv(self):
-        other = mock.MagicMock()
-        self.assertEqual(self.proxy // other, self.obj // other)
-        self.assertEqual(self.proxy.__floordiv__(other), self.obj // other)
-        self.assertEqual(proxy(4.5) // 2, 2)
-        self.assertEqual(proxy(5) // 2, 2)
-
-    def test_mod(self):
-        other = mock.MagicMock()
-        self.assertEqual(self.proxy % other, self.obj % other)
-        self.assertEqual(self.proxy.__mod__(other), self.obj % other)
-        self.assertEqual(proxy(4.5) % 2, 0.5)
-        self.assertEqual(proxy(5) % 2, 1)
-
-    def test_divmod(self):
-        other = mock.MagicMock()
-        self.assertEqual(divmod(self.proxy, other), divmod(self.obj, other))
-        self.assertEqual(self.proxy.__divmod__(other), divmod(self.obj, other))
-        self.assertEqual(divmod(proxy(4.5), 2), (2, 0.5))
-        self.assertEqual(divmod(proxy(5), 2), (2, 1))
-
-    def test_pow(self):
-        other = mock.MagicMock()
-        self.assertEqual(self.proxy ** other, self.obj ** other)
-        self.assertEqual(self.proxy.__pow__(other), self.obj ** other)
-        self.assertEqual(pow(self.proxy, other), self.obj ** other)
-        self.assertEqual(pow(proxy(2), 3), 8)
-
-    def test_lshift(self):
-        other = mock.MagicMock()
-        self.assertEqual(self.proxy << other, self.obj << other)
-        self.assertEqual(self.proxy.__lshift__(other), self.obj << other)
-        self.assertEqual(proxy(1) << 3, 8)
-
-    def test_rshift(self):
-        other = mock.MagicMock()
-        self.assertEqual(self.proxy >> other, self.obj >> other)
-        self.assertEqual(self.proxy.__rshift__(other), self.obj >> other)
-        self.assertEqual(proxy(8) >> 3, 1)
-
-    def test_and(self):
-        other = mock.MagicMock()
-        self.assertEqual(self.proxy & other, self.obj & other)
-        self.assertEqual(self.proxy.__and__(other), self.obj & other)
-        self.assertEqual(proxy(7) & 4, 4)
-
-    def test_xor(self):
-        other = mock.MagicMock()
-        self.assertEqual(self.proxy ^ other, self.obj ^ other)
-        self.assertEqual(self.proxy.__xor__(other), self.obj ^ other)
-        self.assertEqual(proxy(1) ^ 1, 0)
-        self.assertEqual(proxy(1) ^ 0, 1)
-        self.assertEqual(proxy(0) ^ 0, 0)
-        self.assertEqual(proxy(0) ^ 1, 1)
-
-    def test_or(self):
-        other = mock.MagicMock()
-        self.assertEqual(self.proxy | other, self.obj | other)
-        self.assertEqual(self.proxy.__or__(other), self.obj | other)
-        self.assertEqual(proxy(1) | 2, 3)
-
-    def test_radd(self):
-        """ Verify that __radd__ is redirected to the proxiee.  """
+        other = object()
+        expected = operator.div(self.obj, other)
+        self.assertEqual(operator.div(self.proxy, other), expected)
+        self.assertEqual(self.proxy.__div__(other), expected)
+        self.assertEqual(operator.div(cached_proxy(4.5), 2), 2.25)
+        self.assertEqual(operator.div(cached_proxy(5), 2), 2)
+
+    def test_binary_operators__on_values(self):
+        """ Verify that binary operators work on proxies of values. """
+        for op, a, b, result in _BINARY_OPERATOR_RESULTS:
+            with self.subTest(op=op, a=a, b=b):
+                self.assertEqual(op(cached_proxy(a), b), result)
+        for op, a, b in _BINARY_OPERATOR_TYPE_ERRORS:
+            with self.subTest(op=op, a=a, b=b):
+                with self.assertRaises(TypeError):
+                    op(cached_proxy(a), b)
+
+    def test_reflected_operators(self):
+        """ Verify that reflected operators are redirected to the proxiee. """
         # NOTE: ``other`` is anything other than MagicMock to let
-        # the reverse methods do their work. The same rule applies
-        # to all the other test_r* methods so it won't be repeated
-        # there.
-        other = mock.Mock()
-        self.assertEqual(other + self.proxy, other + self.obj)
-        self.assertEqual(self.proxy.__radd__(other), other + self.obj)
-        self.assertEqual(4.5 + proxy(2), 6.5)
-        self.assertEqual(5 + proxy(2), 7)
-        with self.assertRaises(TypeError):
-            2 + proxy("foo")
-        self.assertEqual("foo" + proxy("bar"), "foobar")
-        self.assertEqual([1, 2, 3] + proxy([4, 5]), [1, 2, 3, 4, 5])
-
-    def test_rsub(self):
-        """ Verify that __rsub__ is redirected to the proxiee. """
-        other = mock.Mock()
-        self.assertEqual(other - self.proxy, other - self.obj)
-        self.assertEqual(self.proxy.__rsub__(other), other - self.obj)
-        self.assertEqual(4.5 - proxy(2), 2.5)
-        self.assertEqual(5 - proxy(2), 3)
-        with self.assertRaises(TypeError):
-            "foo" - proxy(2)
+        # the reverse methods do their work.
+        other = object()
+        for dunder, op in _REFLECTED_OPERATORS:
+            with self.subTest(op=op, dunder=dunder):
+                expected = op(other, self.obj)
+                self.assertEqual(op(other, self.proxy), expected)
+                self.assertEqual(getattr(self.proxy, dunder)(other), expected)
 
-    def test_rmul(self):
-        """ Verify that __rmul__ is redirected to the proxiee. """
-        other = mock.Mock()
-        self.assertEqual(other * self.proxy, other * self.obj)
-        self.assertEqual(self.proxy.__rmul__(other), other * self.obj)
-        self.assertEqual(4.5 * proxy(2), 9.0)
-        self.assertEqual(5 * proxy(2), 10)
-        self.assertEqual("foo" * proxy(2), "foofoo")
-
-    @unittest.skipUnless(
-        sys.version_info[0:2] >= (3, 5), "requires python 3.5")
+    @unittest.skipUnless(_PY35, "requires python 3.5")
     def test_rmatmul(self):
         """ Verify that __rmul__ is redirected to the proxiee. """
-        other = mock.Mock()
-        self.assertEqual(operator.matmul(other, self.proxy),
-                         operator.matmul(other, self.obj))
-        self.assertEqual(self.proxy.__rmatmul__(other),
-                         operator.matmul(other, self.obj))
+        other = object()
+        expected = operator.matmul(other, self.obj)
+        self.assertEqual(operator.matmul(other, self.proxy), expected)
+        self.assertEqual(self.proxy.__rmatmul__(other), expected)
 
-    @unittest.skipUnless(sys.version_info[0] == 2, "requires python 2")
+    @unittest.skipUnless(_PY2, "requires python 2")
     def test_rdiv(self):
         """ Verify that __rdiv__ is redirected to the proxiee. """
-        other = mock.Mock()
-        self.assertEqual(operator.div(other, self.proxy),
-                         operator.div(other, self.obj))
-        self.assertEqual(self.proxy.__rdiv__(other),
-                         operator.div(other, self.obj))
-        self.assertEqual(operator.div(4.5, proxy(2)), 2.25)
-        self.assertEqual(operator.div(5, proxy(2)), 2)
-
-    def test_rtruediv(self):
-        """ Verify that __rtruediv__ is redirected to the proxiee. """
-        other = mock.Mock()
-        self.assertEqual(operator.truediv(other, self.proxy),
-                         operator.truediv(other, self.obj))
-        self.assertEqual(self.proxy.__rtruediv__(other),
-                         operator.truediv(other, self.obj))
-        self.assertEqual(operator.truediv(4.5, proxy(2)), 2.25)
-        self.assertEqual(operator.truediv(5, proxy(2)), 2.5)
-
-    def test_rfloordiv(self):
-        """ Verify that __rfloordiv__ is redirected to the proxiee. """
-        other = mock.Mock()
-        self.assertEqual(other // self.proxy, other // self.obj)
-        self.assertEqual(self.proxy.__rfloordiv__(other), other // self.obj)
-        self.assertEqual(4.5 // proxy(2), 2)
-        self.assertEqual(5 // proxy(2), 2)
-
-    def test_rmod(self):
-        """ Verify that __rmod__ is redirected to the proxiee. """
-        other = mock.Mock()
-        self.assertEqual(other % self.proxy, other % self.obj)
-        self.assertEqual(self.proxy.__rmod__(other), other % self.obj)
-        self.assertEqual(4.5 % proxy(2), 0.5)
-        self.assertEqual(5 % proxy(2), 1)
-
-    def test_rdivmod(self):
-        """ Verify that __rdivmod__ is redirected to the proxiee. """
-        other = mock.Mock()
-        self.assertEqual(divmod(other, self.proxy), divmod(other, self.obj))
-        self.assertEqual(
-            self.proxy.__rdivmod__(other), divmod(other, self.obj))
-        self.assertEqual(divmod(4.5, proxy(2)), (2, 0.5))
-        self.assertEqual(divmod(5, proxy(2)), (2, 1))
-
-    def test_rpow(self):
-        """ Verify that __rpow__ is redirected to the proxiee. """
-        other = mock.Mock()
-        self.assertEqual(other ** self.proxy, other ** self.obj)
-        self.assertEqual(self.proxy.__rpow__(other), other ** self.obj)
-        self.assertEqual(pow(other, self.proxy), other ** self.obj)
-        self.assertEqual(pow(2, proxy(3)), 8)
+        other = object()
+        expected = operator.div(other, self.obj)
+        self.assertEqual(operator.div(other, self.proxy), expected)
+        self.assertEqual(self.proxy.__rdiv__(other), expected)
+        self.assertEqual(operator.div(4.5, cached_proxy(2)), 2.25)
+        self.assertEqual(operator.div(5, cached_proxy(2)), 2)
+
+    def test_reflected_operators__on_values(self):
+        """ Verify that reflected operators work on proxies of values. """
+        for op, a, b, result in _BINARY_OPERATOR_RESULTS:
+            with self.subTest(op=op, a=a, b=b):
+                self.assertEqual(op(a, cached_proxy(b)), result)
+        for op, a, b in _BINARY_OPERATOR_TYPE_ERRORS:
+            with self.subTest(op=op, a=a, b=b):
+                with self.assertRaises(TypeError):
+                    op(a, cached_proxy(b))
+        self.assertEqual([1, 2, 3] + proxy([4, 5]), [1, 2, 3, 4, 5])
         with self.assertRaises(TypeError):
             # __rpow__ is not called for the three-argument version of pow()
-            self.assertEqual(pow(2, proxy(10), 1000), 24)
-
-    def test_rlshift(self):
-        """ Verify that __rlshift__ is redirected to the proxiee. """
-        other = mock.Mock()
-        self.assertEqual(other << self.proxy, other << self.obj)
-        self.assertEqual(self.proxy.__rlshift__(other), other << self.obj)
-        self.assertEqual(1 << proxy(3), 8)
-
-    def test_rrshift(self):
-        """ Verify that __rrshift__ is redirected to the proxiee. """
-        other = mock.Mock()
-        self.assertEqual(other >> self.proxy, other >> self.obj)
-        self.assertEqual(self.proxy.__rrshift__(other), other >> self.obj)
-        self.assertEqual(8 >> proxy(3), 1)
-
-    def test_rand(self):
-        """ Verify that __rand__ is redirected to the proxiee. """
-        other = mock.Mock()
-        self.assertEqual(other & self.proxy, other & self.obj)
-        self.assertEqual(self.proxy.__rand__(other), other & self.obj)
-        self.assertEqual(7 & proxy(4), 4)
-
-    def test_rxor(self):
-        """ Verify that __rxor__ is redirected to the proxiee. """
-        other = mock.Mock()
-        self.assertEqual(other ^ self.proxy, other ^ self.obj)
-        self.assertEqual(self.proxy.__rxor__(other), other ^ self.obj)
-        self.assertEqual(1 ^ proxy(1), 0)
-        self.assertEqual(1 ^ proxy(0), 1)
-        self.assertEqual(0 ^ proxy(0), 0)
-        self.assertEqual(0 ^ proxy(1), 1)
-
-    def test_ror(self):
-        """ Verify that __ror__ is redirected to the proxiee. """
-        other = mock.Mock()
-        self.assertEqual(other | self.proxy, other | self.obj)
-        self.assertEqual(self.proxy.__ror__(other), other | self.obj)
-        self.assertEqual(1 | proxy(2), 3)
+            self.assertEqual(pow(2, cached_proxy(10), 1000), 24)
+
+
+class proxy_as_function_inplace_operators(proxy_test_case):
+
+    """ Tests for in-place operators of proxy objects. """
+
+    # NOTE: order of test methods matches implementation
 
     def test_iadd__via_operator__mutable(self):
         """ Verify that += is redirected to the proxiee (mutable case). """
         # Mock__iadd__ that returns the object itself
         self.obj.__iadd__.return_value = self.obj
-        other = mock.MagicMock()
+        other = object()
         proxy_old = self.proxy
         self.proxy += other
         # __iadd__ was called and mutated the state of obj
@@ -643,7 +892,7 @@ class proxy_as_function(unittest.TestCase):
         """ Verify that += is redirected to the proxiee (immutable case). """
         # Mock the absence of __iadd__
         del self.obj.__iadd__
-        other = mock.MagicMock()
+        other = object()
         proxy_old = self.proxy
         self.proxy += other
         # __add__ was called and returned new obj
@@ -658,7 +907,7 @@ class proxy_as_function(unittest.TestCase):
         """ Verify that __iadd__ is redirected to the proxiee. """
         # Mock __iadd__ that returns the object itself
         self.obj.__iadd__.return_value = self.obj
-        other = mock.MagicMock()
+        other = object()
         proxy_old = self.proxy
         self.proxy = self.proxy.__iadd__(other)
         # __iadd__ was called and mutated the state of obj
@@ -673,30 +922,23 @@ class proxy_as_function(unittest.TestCase):
         """ Verify that __iadd__ doesn't show up if not originally present. """
         # Mock the absence of __iadd__
         del self.obj.__iadd__
-        other = mock.MagicMock()
+        other = object()
         with self.assertRaises(AttributeError):
             self.proxy.__iadd__(other)
 
-    def test_iadd__on_int__via_operator(self):
-        """ Verify that += works on proxy[int]. """
-        # int is immutable so += actually works using the + operator
-        a = b = proxy(2)
-        # b is modified, a is unchanged
-        b += 2
-        self.assertEqual(a, 2)
-        self.assertEqual(b, b)
-        self.assertTrue(issubclass(type(a), proxy))
-        self.assertTrue(issubclass(type(b), proxy))
-
-    def test_iadd__on_str__via_operator(self):
-        """ Verify that += works on proxy[str]. """
-        # str is immutable so += actually works using the + operator
-        a = b = proxy("hello")
-        b += " world"
-        self.assertEqual(a, "hello")
-        self.assertEqual(b, "hello world")
-        self.assertTrue(issubclass(type(a), proxy))
-        self.assertTrue(issubclass(type(b), proxy))
+    def test_inplace_operators__on_values(self):
+        """ Verify that in-place operators work on proxies of values. """
+        # These values are immutable so the in-place operators actually work
+        # using the regular operators and return a new proxy.
+        for op, value, other, result in _INPLACE_OPERATOR_RESULTS:
+            with self.subTest(op=op, value=value, other=other):
+                a = b = proxy(value)
+                # b is modified, a is unchanged
+                b = op(b, other)
+                self.assertEqual(a, value)
+                self.assertEqual(b, result)
+                self.assertTrue(issubclass(type(a), proxy))
+                self.assertTrue(issubclass(type(b), proxy))
 
     def test_iadd__on_list__via_operator(self):
         """ Verify that += works on proxy[list]. """
@@ -708,23 +950,14 @@ class proxy_as_function(unittest.TestCase):
         self.assertTrue(issubclass(type(a), proxy))
         self.assertTrue(issubclass(type(b), proxy))
 
-    def test_iadd__on_int__via_dunder(self):
-        """ Verify that __iadd__ doesn't exist on proxy[int]. """
-        a = 2
-        with self.assertRaises(AttributeError):
-            a.__iadd__(2)
-        b = proxy(2)
-        with self.assertRaises(AttributeError):
-            b.__iadd__(2)
-
-    def test_iadd__on_str__via_dunder(self):
-        """ Verify that __iadd__ doesn't exist on proxy[str]. """
-        a = "hello"
-        with self.assertRaises(AttributeError):
-            a.__iadd__(" world")
-        b = proxy("hello")
-        with self.assertRaises(AttributeError):
-            b.__iadd__(" world")
+    def test_iadd__on_immutable__via_dunder(self):
+        """ Verify that __iadd__ doesn't exist on proxy[int] or proxy[str]. """
+        for value, other in ((2, 2), ("hello", " world")):
+            with self.subTest(value=value):
+                with self.assertRaises(AttributeError):
+                    value.__iadd__(other)
+                with self.assertRaises(AttributeError):
+                    proxy(value).__iadd__(other)
 
     def test_iadd__on_list__via_dunder(self):
         """ Verify that __iadd__ works on proxy[list]. """
@@ -736,28 +969,10 @@ class proxy_as_function(unittest.TestCase):
         self.assertTrue(issubclass(type(b), proxy))
         self.assertIs(a, b)
 
-    def test_isub__on_int(self):
-        """ Verify that -= works on proxy[int]. """
-        a = b = proxy(4)
-        b -= 3
-        self.assertEqual(a, 4)
-        self.assertEqual(b, 1)
-        self.assertTrue(issubclass(type(a), proxy))
-        self.assertTrue(issubclass(type(b), proxy))
-
-    def test_imul__on_int(self):
-        """ Verify that *= works on proxy[int]. """
-        a = b = proxy(4)
-        b *= 2
-        self.assertEqual(a, 4)
-        self.assertEqual(b, 8)
-        self.assertTrue(issubclass(type(a), proxy))
-        self.assertTrue(issubclass(type(b), proxy))
-
     # NOTE: there's no type in stdlib that supports matmul so there's no smoke
     # test for that.
 
-    @unittest.skipUnless(sys.version_info[0] == 2, "requires python 2")
+    @unittest.skipUnless(_PY2, "requires python 2")
     def test_idiv__on_int(self):
         """ Verify that (old) /= works on proxy[int]. """
         a = b = proxy(7)
@@ -767,252 +982,11 @@ class proxy_as_function(unittest.TestCase):
         self.assertTrue(issubclass(type(a), proxy))
         self.assertTrue(issubclass(type(b), proxy))
 
-    def test_itruediv__on_int(self):
-        """ Verify that (true) /= works on proxy[int]. """
-        a = b = proxy(7)
-        b = operator.itruediv(b, 2)
-        self.assertEqual(a, 7)
-        self.assertEqual(b, 3.5)
-        self.assertTrue(issubclass(type(a), proxy))
-        self.assertTrue(issubclass(type(b), proxy))
-
-    def test_ifloordiv__on_int(self):
-        """ Verify that //= works on proxy[int]. """
-        a = b = proxy(7)
-        b //= 2
-        self.assertEqual(a, 7)
-        self.assertEqual(b, 3)
-        self.assertTrue(issubclass(type(a), proxy))
-        self.assertTrue(issubclass(type(b), proxy))
-
-    def test_imod__on_int(self):
-        """ Verify that %= works on proxy[int]. """
-        a = b = proxy(7)
-        b %= 2
-        self.assertEqual(a, 7)
-        self.assertEqual(b, 1)
-        self.assertTrue(issubclass(type(a), proxy))
-        self.assertTrue(issubclass(type(b), proxy))
-
-    def test_ipow__on_int(self):
-        """ Verify that **= works on proxy[int]. """
-        a = b = proxy(7)
-        b **= 2
-        self.assertEqual(a, 7)
-        self.assertEqual(b, 49)
-        self.assertTrue(issubclass(type(a), proxy))
-        self.assertTrue(issubclass(type(b), proxy))
-
-    def test_ilshift__on_int(self):
-        """ Verify that <<= works on proxy[int]. """
-        a = b = proxy(1)
-        b <<= 10
-        self.assertEqual(a, 1)
-        self.assertEqual(b, 1024)
-        self.assertTrue(issubclass(type(a), proxy))
-        self.assertTrue(issubclass(type(b), proxy))
-
-    def test_irshift__on_int(self):
-        """ Verify that >>= works on proxy[int]. """
-        a = b = proxy(1024)
-        b >>= 10
-        self.assertEqual(a, 1024)
-        self.assertEqual(b, 1)
-        self.assertTrue(issubclass(type(a), proxy))
-        self.assertTrue(issubclass(type(b), proxy))
-
-    def test_iand__on_int(self):
-        """ Verify that &= works on proxy[int]. """
-        a = b = proxy(7)
-        b &= 4
-        self.assertEqual(a, 7)
-        self.assertEqual(b, 4)
-        self.assertTrue(issubclass(type(a), proxy))
-        self.assertTrue(issubclass(type(b), proxy))
-
-    def test_ixor__on_int(self):
-        """ Verify that ^= works on proxy[int]. """
-        a = b = proxy(7)
-        b ^= 5
-        self.assertEqual(a, 7)
-        self.assertEqual(b, 2)
-        self.assertTrue(issubclass(type(a), proxy))
-        self.assertTrue(issubclass(type(b), proxy))
-
-    def test_ior__on_int(self):
-        """ Verify that |= works on proxy[int]. """
-        a = b = proxy(7)
-        b |= 8
-        self.assertEqual(a, 7)
-        self.assertEqual(b, 15)
-        self.assertTrue(issubclass(type(a), proxy))
-        self.assertTrue(issubclass(type(b), proxy))
-
-    def test_context_manager_methods_v1(self):
-        """ Verify that __enter__ and __exit__ are redirected. """
-        with self.proxy:
-            pass
-        self.obj.__enter__.assert_called_once_with()
-        self.obj.__exit__.assert_called_once_with(None, None, None)
-
-    def test_context_manager_methods_v2(self):
-        """ Verify that redirecting __exit__ passes right arguments. """
-        exc = Exception("boom")
-        with self.assertRaisesRegex(Exception, "boom"):
-            with self.proxy:
-                try:
-                    raise exc
-                except:
-                    traceback = sys.exc_info()[2]
-                    raise
-        self.obj.__enter__.assert_called_once_with()
-        # XXX: it's called with (Exception, exc, traceback) but I don't know
-        # how to reach the traceback here
-        self.obj.__exit__.assert_called_once_with(Exception, exc, traceback)
-
-    def test_hasattr_parity(self):
-        """ verify that hasattr() behaves the same for original and proxy. """
-        class C(object):
-            pass
-        special_methods = str('''
-            __del__
-            __repr__
-            __str__
-            __bytes__
-            __format__
-            __lt__
-            __le__
-            __eq__
-            __ne__
-            __gt__
-            __ge__
-            __cmp__
-            __hash__
-            __bool__
-            __nonzero__
-            __unicode__
-            __getattr__
-            __getattribute__
-            __setattr__
-            __delattr__
-            __dir__
-            __get__
-            __set__
-            __delete__
-            __call__
-            __len__
-            __length_hint__
-            __getitem__
-            __setitem__
-            __delitem__
-            __iter__
-            __reversed__
-            __contains__
-            __add__
-            __sub__
-            __mul__
-            __floordiv__
-            __mod__
-            __divmod__
-            __pow__
-            __lshift__
-            __rshift__
-            __and__
-            __xor__
-            __or__
-            __div__
-            __truediv__
-            __radd__
-            __rsub__
-            __rmul__
-            __rdiv__
-            __rtruediv__
-            __rfloordiv__
-            __rmod__
-            __rdivmod__
-            __rpow__
-            __rlshift__
-            __rrshift__
-            __rand__
-            __rxor__
-            __ror__
-            __iadd__
-            __isub__
-            __imul__
-            __idiv__
-            __itruediv__
-            __ifloordiv__
-            __imod__
-            __ipow__
-            __ilshift__
-            __irshift__
-            __iand__
-            __ixor__
-            __ior__
-            __neg__
-            __pos__
-            __abs__
-            __invert__
-            __complex__
-            __int__
-            __long__
-            __float__
-            __oct__
-            __hex__
-            __index__
-            __coerce__
-            __enter__
-            __exit__
-        ''').split()
-        for obj in [C(), 42, property(lambda x: x), int, None]:
-            self.obj = obj
-            self.proxy = proxy(self.obj)
-            for attr in special_methods:
-                self.assertEqual(
-                    hasattr(self.obj, attr),
-                    hasattr(self.proxy, attr),
-                    "attribute presence mismatch on attr %r and object %r" % (
-                        attr, self.obj))
 
-    def test_isinstance(self):
-        """ Verify that isinstance() checks work. """
-        # NOTE: this method tests the metaclass
-        self.assertIsInstance(self.obj, type(self.obj))
-        self.assertIsInstance(self.proxy, type(self.obj))
-
-    def test_issubclass(self):
-        """ Verify that issubclass() checks work. """
-        # NOTE: this method tests the metaclass
-        # NOTE: mock doesn't support subclasscheck
-        # NOTE: str ... below is just for python 2.7
-        # (__future__.unicode_literals is in effect)
-        obj = str("something other than mock")
-        self.assertTrue(issubclass(str, type(obj)))
-        self.assertTrue(issubclass(str, type(proxy(obj))))
-
-    def test_class(self):
-        """ Verify that proxy_obj.__class__ is redirected to the proxiee. """
-        self.assertEqual(self.proxy.__class__, self.obj.__class__)
-        # NOTE: The proxy cannot hide the fact, that it is a proxy
-        self.assertNotEqual(type(self.proxy), type(self.obj))
-
-
-class proxy_as_class(unittest.TestCase):
+class proxy_as_class(padme_test_case):
 
     """ Tests for uses of proxy() as a base class for specialized proxies. """
 
-    def setUp(self):
-        """ Per-test-case setup function. """
-        if reality_is_broken:
-            print()
-            _logger.debug("STARTING")
-            _logger.debug("[%s]", self._testMethodName)
-
-    def tearDown(self):
-        """ Per-test-case teardown function. """
-        if reality_is_broken:
-            _logger.debug("DONE")
-
     def test_proxy_subclass(self):
         """ Verify that basic @unproxied use case works. """
         # NOTE: bring your comb, because this is the extra-hairy land
@@ -1024,3 +998,19 @@ class proxy_as_class(unittest.TestCase):
         self.assertTrue(issubclass(censored, proxy))
         self.assertEqual(str(censored("freedom")), "*******")
         self.assertEqual(censored("freedom").__str__(), "*******")
+
+    def test_proxy_subclass__instance_assignment(self):
+        """ Verify that @unproxied methods can be replaced on instances. """
+        class greeter(proxy):
+
+            @unproxied
+            def greet(self):
+                return "hello"
+        obj = greeter(42)
+        obj.greet = lambda: "bye"
+        self.assertEqual(obj.greet(), "bye")
+        del obj.greet
+        self.assertEqual(obj.greet(), "hello")
+        with mock.patch.object(obj, 'greet', return_value="patched"):
+            self.assertEqual(obj.greet(), "patched")
+        self.assertEqual(obj.greet(), "hello")